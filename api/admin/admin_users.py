@@ -11,6 +11,7 @@ from pydantic import BaseModel, Field, RootModel
 
 from site_backend.core.neo_driver import session_dep
 from site_backend.core.admin_guard import _decode_token  # or your own admin dependency
+from site_backend.api.eco_local.claims import invalidate_qr_meta
 
 router = APIRouter(prefix="/admin", tags=["admin:users"])
 
@@ -375,4 +376,5 @@ def patch_business_profile(
         rec = tx.run(cypher, **params).single()
         if not rec:
             raise HTTPException(status_code=404, detail="BusinessProfile not found")
+        invalidate_qr_meta(bp_id)
         return serialize_bp(rec["bp"])  # ← normalize
@@ -0,0 +1,109 @@
+# api/eco_local/balance_cache.py
+"""
+Per-worker cache of youth offer-wallet balances (EARNED MINT_ACTION minus
+SPENT BURN_REWARD/CONTRIBUTE), used by read-only views like the QR scan modal.
+
+Spend checks (offers.py redeem) never read this cache: they run
+WALLET_BALANCE_Q against Neo4j, i.e. User.eco_balance when present, else the
+ledger sum. Writers in this process keep the cache warm via put()/adjust();
+writes in other workers are picked up when the short TTL lapses.
+
+The authoritative number is the ledger sum (see WALLET_BALANCE_Q). Writers also keep
+a denormalized `User.eco_balance` in step; readers use it when present and fall
+back to the ledger for users the backfill hasn't reached yet.
+"""
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from neo4j import Session
+
+BALANCE_TTL_S = 60.0
+
+# Earned: MINT_ACTION (settled); Spent: BURN_REWARD, CONTRIBUTE (settled).
+# User.eco_balance when present, else the ledger sum; the ledger subqueries
+# only expand for users that haven't been backfilled.
+WALLET_BALANCE_Q = """
+OPTIONAL MATCH (u:User {id:$uid})
+// Earned (posted)
+CALL {
+  WITH u
+  OPTIONAL MATCH (u)-[:EARNED]->(te:EcoTx {status:'settled'})
+  WHERE u.eco_balance IS NULL AND te.kind IN ['MINT_ACTION']
+  RETURN coalesce(sum(toInteger(coalesce(te.amount, te.eco, 0))), 0) AS earned
+}
+// Spent (posted)
+CALL {
+  WITH u
+  OPTIONAL MATCH (u)-[:SPENT]->(ts:EcoTx {status:'settled'})
+  WHERE u.eco_balance IS NULL AND ts.kind IN ['BURN_REWARD','CONTRIBUTE']
+  RETURN coalesce(sum(toInteger(coalesce(ts.amount, ts.eco, 0))), 0) AS spent
+}
+RETURN toInteger(coalesce(u.eco_balance, earned - spent)) AS balance
+"""
+
+_lock = threading.Lock()
+_entries: Dict[str, Tuple[float, int]] = {}
+
+
+def get(user_id: str) -> Optional[int]:
+    hit = _entries.get(user_id)
+    if hit is None:
+        return None
+    expires, bal = hit
+    if expires < time.monotonic():
+        with _lock:
+            _entries.pop(user_id, None)
+        return None
+    return bal
+
+
+def put(user_id: str, balance: int) -> None:
+    with _lock:
+        _entries[user_id] = (time.monotonic() + BALANCE_TTL_S, int(balance))
+
+
+def adjust(user_id: str, delta: int) -> None:
+    """Apply a ledger delta to a cached balance; no-op if not cached."""
+    with _lock:
+        hit = _entries.get(user_id)
+        if hit is not None:
+            _entries[user_id] = (hit[0], hit[1] + int(delta))
+
+
+def invalidate(user_id: str) -> None:
+    with _lock:
+        _entries.pop(user_id, None)
+
+
+def backfill_eco_balances(s: Session) -> Dict[str, Any]:
+    """
+    One-off / repair job: write User.eco_balance from the ledger for every user.
+    Batched (auto-commit session required for IN TRANSACTIONS).
+    """
+    s.run(
+        """
+        MATCH (u:User)
+        CALL {
+          WITH u
+          CALL {
+            WITH u
+            OPTIONAL MATCH (u)-[:EARNED]->(te:EcoTx {status:'settled'})
+            WHERE te.kind IN ['MINT_ACTION']
+            RETURN coalesce(sum(toInteger(coalesce(te.amount, te.eco, 0))), 0) AS earned
+          }
+          CALL {
+            WITH u
+            OPTIONAL MATCH (u)-[:SPENT]->(ts:EcoTx {status:'settled'})
+            WHERE ts.kind IN ['BURN_REWARD','CONTRIBUTE']
+            RETURN coalesce(sum(toInteger(coalesce(ts.amount, ts.eco, 0))), 0) AS spent
+          }
+          SET u.eco_balance = toInteger(earned - spent)
+        } IN TRANSACTIONS OF 1000 ROWS
+        """
+    ).consume()
+    rec = s.run("MATCH (u:User) RETURN count(u) AS users").single()
+    with _lock:
+        _entries.clear()
+    return {"ok": True, "users": int(rec["users"]) if rec else 0}
@@ -30,16 +30,20 @@ log.info("Stripe key loaded: %s", ("YES (len=%d)" % len(stripe.api_key)) if stri
 # Edit here if your edge names differ (e.g., :ADMIN_OF)
 _OWNS_RELS = ":OWNS|MANAGES"
 
+_USER_BIZ_IDS_Q = f"""
+MATCH (u:User {{id:$uid}})-[{_OWNS_RELS}]->(b:BusinessProfile)
+RETURN b.id AS id
+ORDER BY id
+"""
+
+_USER_OWNS_BIZ_Q = f"""
+MATCH (u:User {{id:$uid}})-[{_OWNS_RELS}]->(b:BusinessProfile {{id:$bid}})
+RETURN 1 AS ok
+"""
+
 
 def _user_business_ids(s: Session, user_id: str) -> List[str]:
-    recs = s.run(
-        f"""
-        MATCH (u:User {{id:$uid}})-[{_OWNS_RELS}]->(b:BusinessProfile)
-        RETURN b.id AS id
-        ORDER BY id
-        """,
-        uid=user_id,
-    )
+    recs = s.run(_USER_BIZ_IDS_Q, uid=user_id)
     return [r["id"] for r in recs]
 
 
@@ -53,14 +57,7 @@ def _resolve_user_business_id(
       - many   -> 400 with list so caller can choose
     """
     if requested_business_id:
-        ok = s.run(
-            f"""
-            MATCH (u:User {{id:$uid}})-[{_OWNS_RELS}]->(b:BusinessProfile {{id:$bid}})
-            RETURN 1 AS ok
-            """,
-            uid=user_id,
-            bid=requested_business_id,
-        ).single()
+        ok = s.run(_USER_OWNS_BIZ_Q, uid=user_id, bid=requested_business_id).single()
         if not ok:
             raise HTTPException(status_code=403, detail="You don't have access to that business")
         return requested_business_id
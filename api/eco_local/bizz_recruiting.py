@@ -9,6 +9,9 @@ from fastapi import APIRouter, HTTPException, Query
 
 from neo4j import GraphDatabase
 from neo4j.graph import Node, Relationship, Path
+
+from site_backend.core.neo_driver import POOL_OPTS, SESSION_OPTS
+
 try:
     # neo4j temporal helpers
     from neo4j.time import DateTime as NeoDateTime, Date as NeoDate, Time as NeoTime, Duration as NeoDuration
@@ -23,7 +26,7 @@ NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
 
-_driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+_driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD), **POOL_OPTS)
 
 
 def _iso(v: Any) -> Any:
@@ -70,12 +73,19 @@ def _coerce_neo(v: Any) -> Any:
 
 def _run(cy: str, params: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
     """Single-session runner, returns JSON-safe rows."""
-    with _driver.session() as s:
+    with _driver.session(**SESSION_OPTS) as s:
         rs = s.run(cy, **(params or {}))
         rows = [r.data() for r in rs]
         return [_coerce_neo(r) for r in rows]
 
 
+def _run_one(cy: str, params: Dict[str, Any] | None = None) -> Optional[Dict[str, Any]]:
+    """Like _run for queries that return exactly one row; skips building a list."""
+    with _driver.session(**SESSION_OPTS) as s:
+        rec = s.run(cy, **(params or {})).single(strict=False)
+        return _coerce_neo(rec.data()) if rec else None
+
+
 # ─────────────────────────────────────────────────────────
 # Router
 # ─────────────────────────────────────────────────────────
@@ -97,7 +107,7 @@ def _safe_date(s: Optional[str]) -> date:
 # ─────────────────────────────────────────────────────────
 @router.get("/overview")
 def overview() -> Dict[str, Any]:
-    totals = _run(
+    totals = _run_one(
         """
         CALL { MATCH (p:Prospect) RETURN count(p) AS prospects }
         CALL { MATCH (p:Prospect) WHERE coalesce(p.qualified,false)=true RETURN count(p) AS qualified }
@@ -106,9 +116,9 @@ def overview() -> Dict[str, Any]:
         CALL { MATCH (p:Prospect) WHERE coalesce(p.won,false)=true RETURN count(p) AS won }
         RETURN prospects, qualified, active_threads, unsubscribed, won
         """
-    )[0]
+    )
 
-    outreach = _run(
+    outreach = _run_one(
         """
         CALL {
           MATCH (p:Prospect)
@@ -122,9 +132,9 @@ def overview() -> Dict[str, Any]:
         }
         RETURN { started: started, attempts_total: attempts_total, last_outreach_at: last_outreach_at } AS outreach
         """
-    )[0]["outreach"]
+    )["outreach"]
 
-    success = _run(
+    success = _run_one(
         """
         CALL { MATCH (p:Prospect) WHERE coalesce(p.won,false)=true RETURN count(p) AS wins }
         CALL { MATCH (p:Prospect) RETURN count(p) AS total }
@@ -138,9 +148,9 @@ def overview() -> Dict[str, Any]:
         }
         RETURN { win_rate: rate, last_7d_wins: last7 } AS success
         """
-    )[0]["success"]
+    )["success"]
 
-    holds = _run(
+    holds = _run_one(
         """
         WITH date() AS today
         OPTIONAL MATCH (h:CalendarHold)
@@ -150,7 +160,7 @@ def overview() -> Dict[str, Any]:
              sum(CASE WHEN d > today AND d <= today + duration({days:7}) THEN 1 ELSE 0 END) AS next_7d_count
         RETURN { today_count: coalesce(today_count,0), next_7d_count: coalesce(next_7d_count,0) } AS holds
         """
-    )[0]["holds"]
+    )["holds"]
 
     inbox = {"last_poll_at": None, "last_poll_processed": None}
 
@@ -215,16 +225,16 @@ def get_thread(email: str) -> Dict[str, Any]:
     """
     params = {"email": email}
 
-    trows = _run(
+    trow = _run_one(
         """
         OPTIONAL MATCH (p:Prospect {email:$email})
         OPTIONAL MATCH (t:Thread {email:$email})
         RETURN p, t
         """,
         params,
-    )
-    prospect = (trows[0].get("p") if trows else None) or {"email": email}
-    thread = (trows[0].get("t") if trows else None) or {"email": email}
+    ) or {}
+    prospect = trow.get("p") or {"email": email}
+    thread = trow.get("t") or {"email": email}
 
     inbound = [
         r["m"]
@@ -394,7 +404,7 @@ def nudge(email: str) -> Dict[str, Any]:
 # ─────────────────────────────────────────────────────────
 @router.post("/threads/{email}/cancel-holds")
 def cancel_holds(email: str) -> Dict[str, Any]:
-    touched = _run(
+    touched = _run_one(
         """
         MATCH (p:Prospect {email:$email})-[rel:HAS_HOLD]->(h:CalendarHold)
         DELETE rel
@@ -402,7 +412,7 @@ def cancel_holds(email: str) -> Dict[str, Any]:
         RETURN count(h) AS touched
         """,
         {"email": email},
-    )[0]["touched"]
+    )["touched"]
     return {"ok": True, "touched": touched}
 
 
@@ -412,14 +422,14 @@ def cancel_holds(email: str) -> Dict[str, Any]:
 @router.post("/runs/{dateISO}/create")
 def runs_create(dateISO: str) -> Dict[str, Any]:
     d = _safe_date(dateISO).isoformat()
-    row = _run(
+    row = _run_one(
         """
         MERGE (r:ECOLocalRun {date: date($d)})
           ON CREATE SET r.created_at = datetime()
         RETURN r
         """,
         {"d": d},
-    )[0]["r"]
+    )["r"]
     return {"run": row}
 
 
@@ -443,7 +453,7 @@ def runs_freeze(dateISO: str) -> Dict[str, Any]:
 @router.post("/runs/{dateISO}/send")
 def runs_send(dateISO: str) -> Dict[str, Any]:
     d = _safe_date(dateISO).isoformat()
-    sent = _run(
+    sent = _run_one(
         """
         MATCH (m:Draft {run_date: date($d)})
         SET m.sent = true, m.sent_at = datetime()
@@ -461,7 +471,7 @@ def runs_send(dateISO: str) -> Dict[str, Any]:
         RETURN count(m) AS sent
         """,
         {"d": d},
-    )[0]["sent"]
+    )["sent"]
     return {"date": d, "sent": int(sent)}
 # ─────────────────────────────────────────────────────────
 # ADD: imports
@@ -507,10 +517,10 @@ def update_prospect(pid: str, patch: ProspectPatch) -> Dict[str, Any]:
     }
     # If nothing to set, just echo current
     if not allow:
-        row = _run("MATCH (p:Prospect {id:$pid}) RETURN p", {"pid": pid})[0]["p"]
+        row = _run_one("MATCH (p:Prospect {id:$pid}) RETURN p", {"pid": pid})["p"]
         return {"prospect": row}
 
-    row = _run(
+    row = _run_one(
         """
         MATCH (p:Prospect {id:$pid})
         SET p += $allow,
@@ -518,7 +528,7 @@ def update_prospect(pid: str, patch: ProspectPatch) -> Dict[str, Any]:
         RETURN p
         """,
         {"pid": pid, "allow": allow},
-    )[0]["p"]
+    )["p"]
     return {"prospect": row}
 
 # ─────────────────────────────────────────────────────────
@@ -9,11 +9,12 @@ from neo4j import Session
 
 from site_backend.core.neo_driver import session_dep
 from site_backend.core.user_guard import current_user_id
+from site_backend.api.eco_local.claims import invalidate_qr_meta
 from site_backend.api.eco_local.neo_business import (
     business_by_owner,
     business_update_public_profile,
     get_business_metrics,
-    get_business_activity,
+    iter_business_activity,
 )
 
 router = APIRouter(prefix="/eco-local/business", tags=["eco_local-business"])
@@ -95,6 +96,7 @@ def patch_profile(
         owner_user_id=uid,
         fields={k: v for k, v in patch.model_dump(exclude_unset=True).items()}
     )
+    invalidate_qr_meta(b["id"])
     merged = {**b, **out}
     return BusinessMineOut(**merged)
 
@@ -115,11 +117,14 @@ def metrics(
 @router.get("/activity", response_model=List[ActivityRow])
 def activity(
     limit: int = Query(50, ge=1, le=200),
+    before: Optional[int] = Query(None, description="Keyset cursor: createdAt (ms) of the last row seen"),
     s: Session = Depends(session_dep),
     uid: str = Depends(current_user_id),
 ):
     b = business_by_owner(s, user_id=uid)
     if not b:
         raise HTTPException(status_code=404, detail="No business found for this account")
-    rows = get_business_activity(s, business_id=b["id"], limit=limit)
-    return [ActivityRow(**r) for r in rows]
+    return [
+        ActivityRow(**r)
+        for r in iter_business_activity(s, business_id=b["id"], limit=limit, before_ms=before)
+    ]
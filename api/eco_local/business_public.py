@@ -4,18 +4,21 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Literal, Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from neo4j import Session
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from neo4j import AsyncSession
+from pydantic import BaseModel, ConfigDict
 
-from site_backend.core.neo_driver import session_dep
+from site_backend.core.neo_driver import async_session_dep
 
-router = APIRouter(prefix="/eco-local/business/public", tags=["eco_local-business-public"])
+router = APIRouter(prefix="/eco-local/business/public", tags=["eco_local-business-public"], default_response_class=ORJSONResponse)
 
 # ---------------------------------------------------------
 # Models
 # ---------------------------------------------------------
 
 class BusinessPublicOut(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     id: str
     name: Optional[str] = None
     tagline: Optional[str] = None
@@ -39,6 +42,8 @@ class BusinessPublicOut(BaseModel):
     open_now: Optional[bool] = None
 
 class BusinessPublicStatsOut(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     business_id: str
     eco_collected_total: int
     eco_collected_30d: int
@@ -48,6 +53,8 @@ class BusinessPublicStatsOut(BaseModel):
 OfferStatus = Literal["active", "paused", "hidden"]
 
 class OfferPublicOut(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     id: str
     business_id: str
     title: str
@@ -84,8 +91,8 @@ def _norm_uploadish(raw: Optional[str]) -> Optional[str]:
 # ---------------------------------------------------------
 
 @router.get("/{business_id}", response_model=BusinessPublicOut)
-def public_profile(business_id: str, s: Session = Depends(session_dep)):
-    rec = s.run(
+async def public_profile(business_id: str, s: AsyncSession = Depends(async_session_dep)):
+    result = await s.run(
         """
         MATCH (b:BusinessProfile {id:$bid})
         // comment out the next line to expose all businesses
@@ -117,7 +124,8 @@ def public_profile(business_id: str, s: Session = Depends(session_dep)):
           coalesce(b.open_now, NULL)   AS open_now
         """,
         bid=business_id,
-    ).single()
+    )
+    rec = await result.single()
 
     if not rec:
         raise HTTPException(status_code=404, detail="Business not found")
@@ -132,14 +140,14 @@ def public_profile(business_id: str, s: Session = Depends(session_dep)):
 # ---------------------------------------------------------
 
 @router.get("/{business_id}/stats", response_model=BusinessPublicStatsOut)
-def business_public_stats(business_id: str, s: Session = Depends(session_dep)):
+async def business_public_stats(business_id: str, s: AsyncSession = Depends(async_session_dep)):
     end_dt = datetime.now(timezone.utc)
     start_dt = end_dt - timedelta(days=30)
 
     start_iso = start_dt.isoformat()
     end_iso = end_dt.isoformat()
 
-    rec = s.run(
+    result = await s.run(
         """
         MATCH (b:BusinessProfile {id:$bid})
 
@@ -155,27 +163,29 @@ def business_public_stats(business_id: str, s: Session = Depends(session_dep)):
                ELSE datetime.transaction()
              END AS tat
 
+        WITH b, eco_val, tat,
+             tat >= datetime($start_iso) AND tat < datetime($end_iso) AS in30
+
         WITH b,
              sum(eco_val) AS collected_total,
              max(tat)     AS lastTat,
-             collect({tat: tat, eco: eco_val}) AS alltx
-
-        WITH b, collected_total, lastTat,
-             [t IN alltx WHERE t.tat >= datetime($start_iso) AND t.tat < datetime($end_iso)] AS last30
+             sum(CASE WHEN in30 THEN eco_val ELSE 0 END) AS eco_30d,
+             count(CASE WHEN in30 THEN 1 END)            AS n_30d
 
         RETURN
           toInteger(coalesce(b.eco_collected_total, collected_total, 0)) AS eco_collected_total,
-          toInteger(reduce(s=0, x IN last30 | s + toInteger(x.eco)))     AS eco_collected_30d,
-          toInteger(size(last30))                                         AS contributions_30d,
+          toInteger(eco_30d)                                              AS eco_collected_30d,
+          toInteger(n_30d)                                                AS contributions_30d,
           CASE WHEN lastTat IS NULL THEN NULL ELSE toString(lastTat) END  AS last_collected_at
         """,
         {"bid": business_id, "start_iso": start_iso, "end_iso": end_iso},
-    ).single()
+    )
+    rec = await result.single()
 
     if not rec:
         raise HTTPException(status_code=404, detail="Business not found")
 
-    return BusinessPublicStatsOut(
+    return BusinessPublicStatsOut.model_construct(
         business_id=business_id,
         eco_collected_total=int(rec["eco_collected_total"] or 0),
         eco_collected_30d=int(rec["eco_collected_30d"] or 0),
@@ -188,8 +198,8 @@ def business_public_stats(business_id: str, s: Session = Depends(session_dep)):
 # ---------------------------------------------------------
 
 @router.get("/{business_id}/offers", response_model=List[OfferPublicOut])
-def public_offers_for_business(business_id: str, s: Session = Depends(session_dep)):
-    recs = s.run(
+async def public_offers_for_business(business_id: str, s: AsyncSession = Depends(async_session_dep)):
+    recs = await s.run(
         """
         MATCH (b:BusinessProfile {id:$bid})
         WHERE coalesce(b.visible_on_map, true) = true
@@ -209,7 +219,7 @@ def public_offers_for_business(business_id: str, s: Session = Depends(session_de
         bid=business_id,
     )
     out: List[OfferPublicOut] = []
-    for r in recs:
+    async for r in recs:
         o: Dict[str, Any] = dict(r["offer"])
         o.setdefault("status", "active")
         if o.get("business_id") is None:
@@ -1,21 +1,28 @@
 from __future__ import annotations
 
 import hashlib
+import threading
+import time
 from dataclasses import dataclass
+from math import atan2, cos, radians, sin, sqrt
 from datetime import datetime, timezone
-from typing import Optional, Literal, List, Dict, Any
+from typing import Optional, Literal, List, Dict, Any, Tuple
 import os
 from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
-from neo4j import Session
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from neo4j import AsyncSession
+from pydantic import BaseModel, ConfigDict
 
-from site_backend.core.neo_driver import session_dep
+from site_backend.core.neo_driver import async_session_dep
 from site_backend.core.user_guard import current_user_id  # 👈 use real logged-in youth
+from site_backend.api.eco_local import balance_cache
 
-router = APIRouter(prefix="/eco-local", tags=["eco-local"])
+router = APIRouter(prefix="/eco-local", tags=["eco-local"], default_response_class=ORJSONResponse)
 
 PledgeTier = Literal["starter", "builder", "leader"]
 DISABLE_GEOFENCE = os.getenv("ECO_LOCAL_DISABLE_GEOFENCE", "false").lower() == "true"
+SCAN_IDEMPOTENCY_TTL_S = 5.0
+QR_META_TTL_S = 120.0
 
 
 # ---------- Request / Response models ----------
@@ -35,6 +42,8 @@ class ClaimableOffer(BaseModel):
     eco_price is what the youth must spend.
     can_claim is computed from the youth's ECO balance.
     """
+    model_config = ConfigDict(extra="ignore", validate_assignment=False, frozen=True)
+
     id: str
     title: str
     blurb: Optional[str] = None
@@ -51,6 +60,8 @@ class QRScanOffersResponse(BaseModel):
       - their current ECO balance (offer wallet)
       - list of active offers with affordability.
     """
+    model_config = ConfigDict(extra="ignore", validate_assignment=False, frozen=True)
+
     ok: bool
     reason: Optional[str] = None  # e.g. "geofence"
     business_id: Optional[str] = None
@@ -71,24 +82,45 @@ def _device_hash(ip: str, ua: str) -> str:
     Kept for possible analytics / anti-abuse later,
     but NOT used for wallet identity anymore.
     """
-    h = hashlib.sha256()
-    h.update((ip or "-").encode())
-    h.update((ua or "-").encode())
-    return h.hexdigest()[:16]
+    return hashlib.blake2b(
+        (ip or "-").encode() + b"\x1f" + (ua or "-").encode(), digest_size=8
+    ).hexdigest()
 
 
 def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    import math as m
     R = 6371000.0
-    phi1 = m.radians(lat1)
-    phi2 = m.radians(lat2)
-    dphi = m.radians(lat2 - lat1)
-    dl = m.radians(lon2 - lon1)
-    a = m.sin(dphi / 2) ** 2 + m.cos(phi1) * m.cos(phi2) * m.sin(dl / 2) ** 2
-    c = 2 * m.atan2(m.sqrt(a), m.sqrt(1 - a))
+    phi1 = radians(lat1)
+    phi2 = radians(lat2)
+    dphi = radians(lat2 - lat1)
+    dl = radians(lon2 - lon1)
+    a = sin(dphi / 2) ** 2 + cos(phi1) * cos(phi2) * sin(dl / 2) ** 2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
     return R * c
 
 
+def _outside_radius(lat1: float, lon1: float, lat2: float, lon2: float, radius_m: float) -> bool:
+    # Shop-sized radii (default 150 m): compare squared equirectangular distance
+    # in radians against (r/R)^2 — no sqrt, one cos. Beyond a kilometre, the bbox
+    # reject first and haversine only for near-misses.
+    if radius_m < 1000:
+        x = radians(lon2 - lon1) * cos(radians((lat1 + lat2) * 0.5))
+        y = radians(lat2 - lat1)
+        r = radius_m / 6371000.0
+        return x * x + y * y > r * r
+    return _outside_bbox(lat1, lon1, lat2, lon2, radius_m) or _haversine_m(lat1, lon1, lat2, lon2) > radius_m
+
+
+def _outside_bbox(lat1: float, lon1: float, lat2: float, lon2: float, radius_m: float) -> bool:
+    """
+    Cheap reject: if either axis alone is further than the radius the point
+    is certainly outside, so haversine only runs for near-misses.
+    """
+    dlat_m = abs(lat2 - lat1) * 111_320.0
+    if dlat_m > radius_m:
+        return True
+    return abs(lon2 - lon1) * 111_320.0 * cos(radians(lat1)) > radius_m
+
+
 @dataclass
 class DBQRMeta:
     code: str
@@ -101,26 +133,7 @@ class DBQRMeta:
     pledge_tier: PledgeTier
     rules_geofence_radius_m: Optional[int]
 
-def _fetch_qr_meta(s: Session, code: str) -> Optional[DBQRMeta]:
-    rec = s.run(
-        """
-        MATCH (q:QR {code:$code})-[:OF]->(b:BusinessProfile)
-        WITH properties(q) AS q, properties(b) AS b
-        RETURN
-          q['code'] AS code,
-          b['id'] AS bid,
-          b['name'] AS bname,
-          coalesce(b['area'], b['location'], b['suburb']) AS locname,
-          toFloat(coalesce(q['lat'], b['lat'])) AS qlat,
-          toFloat(coalesce(q['lng'], b['lng'])) AS qlng,
-          coalesce(q['active'], true) AS qactive,
-          coalesce(b['pledge_tier'], 'starter') AS pledge_tier,
-          toInteger(coalesce(b['rules_geofence_radius_m'], 150)) AS geofence_m
-        """,
-        code=code,
-    ).single()
-    if not rec:
-        return None
+def _meta_from_record(rec) -> DBQRMeta:
     return DBQRMeta(
         code=rec["code"],
         business_id=rec["bid"],
@@ -134,109 +147,188 @@ def _fetch_qr_meta(s: Session, code: str) -> Optional[DBQRMeta]:
     )
 
 
+def _offer_from_record(o: Dict[str, Any]) -> Dict[str, Any]:
+    stock = o.get("stock")
+    return {
+        "id": o["id"],
+        "title": o["title"],
+        "blurb": o.get("blurb"),
+        "eco_price": int(o["eco_price"] or 0),
+        "stock": int(stock) if stock is not None and int(stock) >= 0 else None,
+        "valid_until": o.get("valid_until"),
+    }
 
-# ---------- Wallet balance (parity with offers.py) ----------
 
-def _wallet_balance_for_offers(s: Session, user_id: str) -> int:
-    """
-    EXACT same wallet math as offers.py::_user_wallet_balance:
+# ---------- QR meta cache ----------
+# QR → business meta changes on the order of days; keep it per worker so unknown-
+# inactive codes and out-of-range scans can be answered without a DB round trip.
+# Only found codes are cached (a brand-new QR must resolve immediately).
+_qr_meta_lock = threading.Lock()
+_qr_meta_cache: Dict[str, Tuple[float, DBQRMeta]] = {}
 
-      Earned: MINT_ACTION (settled)
-      Spent:  BURN_REWARD, CONTRIBUTE (settled)
 
-    This ensures the balance shown in the QR modal matches what
-    /offers/{offer_id}/redeem will actually use.
-    """
-    row = s.run(
-        """
-        // Earned (posted)
-        CALL {
-          WITH $uid AS uid
-          OPTIONAL MATCH (:User {id: uid})-[:EARNED]->(te:EcoTx {status:'settled'})
-          WHERE te.kind IN ['MINT_ACTION']
-          RETURN coalesce(sum(toInteger(coalesce(te.amount, te.eco, 0))), 0) AS earned
-        }
-        // Spent (posted)
-        CALL {
-          WITH $uid AS uid
-          OPTIONAL MATCH (:User {id: uid})-[:SPENT]->(ts:EcoTx {status:'settled'})
-          WHERE ts.kind IN ['BURN_REWARD','CONTRIBUTE']
-          RETURN coalesce(sum(toInteger(coalesce(ts.amount, ts.eco, 0))), 0) AS spent
-        }
-        RETURN toInteger(earned - spent) AS balance
-        """,
+def _cached_qr_meta(code: str) -> Optional[DBQRMeta]:
+    hit = _qr_meta_cache.get(code)
+    if hit is None or hit[0] < time.monotonic():
+        return None
+    return hit[1]
+
+
+def _remember_qr_meta(meta: DBQRMeta) -> None:
+    with _qr_meta_lock:
+        _qr_meta_cache[meta.code] = (time.monotonic() + QR_META_TTL_S, meta)
+
+
+def invalidate_qr_meta(business_id: Optional[str] = None) -> None:
+    """Drop cached QR meta for one business (or everything). Call after profile/rule writes."""
+    with _qr_meta_lock:
+        if business_id is None:
+            _qr_meta_cache.clear()
+            return
+        for code in [c for c, (_, m) in _qr_meta_cache.items() if m.business_id == business_id]:
+            _qr_meta_cache.pop(code, None)
+
+
+# One round trip for the whole scan view: QR meta, the youth's offer-wallet
+# balance and the business's active offers.
+#
+# Balance uses EXACT same wallet math as offers.py::_user_wallet_balance:
+#   Earned: MINT_ACTION (settled)
+#   Spent:  BURN_REWARD, CONTRIBUTE (settled)
+# so the balance shown in the QR modal matches what /offers/{offer_id}/redeem
+# will actually use. The ledger subqueries only expand when User.eco_balance
+# hasn't been backfilled (see balance_cache).
+#
+# Offers support both legacy (b)-[:HAS_OFFER]->(o) and new (o)-[:OF]->(b)
+# wiring, and do NOT require eco_price > 0 (0 / missing shows as 0 ECO).
+_SCAN_VIEW_Q = """
+MATCH (q:QR {code:$code})-[:OF]->(b:BusinessProfile)
+OPTIONAL MATCH (u:User {id:$uid})
+CALL {
+  WITH u
+  OPTIONAL MATCH (u)-[:EARNED]->(te:EcoTx {status:'settled'})
+  WHERE u.eco_balance IS NULL AND te.kind IN ['MINT_ACTION']
+  RETURN coalesce(sum(toInteger(coalesce(te.amount, te.eco, 0))), 0) AS earned
+}
+CALL {
+  WITH u
+  OPTIONAL MATCH (u)-[:SPENT]->(ts:EcoTx {status:'settled'})
+  WHERE u.eco_balance IS NULL AND ts.kind IN ['BURN_REWARD','CONTRIBUTE']
+  RETURN coalesce(sum(toInteger(coalesce(ts.amount, ts.eco, 0))), 0) AS spent
+}
+CALL {
+  WITH b
+  // New style: (o)-[:OF]->(b)
+  OPTIONAL MATCH (o1:Offer)-[:OF]->(b)
+  // Legacy style: (b)-[:HAS_OFFER]->(o)
+  OPTIONAL MATCH (b)-[:HAS_OFFER]->(o2:Offer)
+  WITH coalesce(o1, o2) AS o
+  WHERE o IS NOT NULL
+    AND coalesce(o.status, 'active') = 'active'
+    AND coalesce(o.visible, true) = true
+    AND (
+          o.valid_until IS NULL
+       OR o.valid_until = ''
+       OR date(o.valid_until) >= date($today)
+    )
+  WITH o ORDER BY o.title ASC
+  RETURN collect({
+    id: o.id,
+    title: o.title,
+    blurb: o.blurb,
+    eco_price: toInteger(coalesce(o.eco_price, 0)),
+    stock: toInteger(coalesce(o.stock, -1)),
+    valid_until: o.valid_until
+  }) AS offers
+}
+RETURN
+  q.code AS code,
+  b.id AS bid,
+  b.name AS bname,
+  coalesce(b.area, b.location, b.suburb) AS locname,
+  toFloat(coalesce(q.lat, b.lat)) AS qlat,
+  toFloat(coalesce(q.lng, b.lng)) AS qlng,
+  coalesce(q.active, true) AS qactive,
+  coalesce(b.pledge_tier, 'starter') AS pledge_tier,
+  toInteger(coalesce(b.rules_geofence_radius_m, 150)) AS geofence_m,
+  toInteger(coalesce(u.eco_balance, earned - spent)) AS balance,
+  offers
+"""
+
+
+async def _fetch_scan_view(
+    s: AsyncSession, code: str, user_id: Optional[str]
+) -> Tuple[Optional[DBQRMeta], int, List[Dict[str, Any]]]:
+    """user_id=None skips the wallet lookup (balance comes back as 0)."""
+    res = await s.run(
+        _SCAN_VIEW_Q,
+        code=code,
         uid=user_id,
-    ).single()
-    return int(row["balance"]) if row and row["balance"] is not None else 0
+        today=_now_utc().date().isoformat(),
+    )
+    rec = await res.single()
+    if not rec:
+        return None, 0, []
+    balance = int(rec["balance"]) if rec["balance"] is not None else 0
+    return _meta_from_record(rec), balance, [_offer_from_record(o) for o in rec["offers"] or []]
 
 
-# ---------- Active offers for the business ----------
-def _active_offers_for_business(s: Session, business_id: str) -> List[Dict[str, Any]]:
-    """
-    Active, visible offers for a business.
+# Double-taps / retried requests for the same (user, QR) within a few seconds get
+# the previous response instead of re-running the reads. Per worker.
+_recent_scans: Dict[Tuple[str, str], Tuple[float, "QRScanOffersResponse"]] = {}
 
-    Supports both legacy (b)-[:HAS_OFFER]->(o) and new (o)-[:OF]->(b) wiring.
-    Does NOT require eco_price > 0, so 0 / missing eco_price shows as 0 ECO.
-    """
-    today_iso = _now_utc().date().isoformat()
-    recs = s.run(
-        """
-        MATCH (b:BusinessProfile {id:$bid})
-
-        // New style: (o)-[:OF]->(b)
-        OPTIONAL MATCH (o1:Offer)-[:OF]->(b)
-
-        // Legacy style: (b)-[:HAS_OFFER]->(o)
-        OPTIONAL MATCH (b)-[:HAS_OFFER]->(o2:Offer)
-
-        WITH b, coalesce(o1, o2) AS o
-        WHERE o IS NOT NULL
-          AND coalesce(o.status, 'active') = 'active'
-          AND coalesce(o.visible, true) = true
-          AND (
-                o.valid_until IS NULL
-             OR o.valid_until = ''
-             OR date(o.valid_until) >= date($today)
-          )
-
-        RETURN
-          o.id AS id,
-          o.title AS title,
-          o.blurb AS blurb,
-          toInteger(coalesce(o.eco_price, 0)) AS eco_price,
-          toInteger(coalesce(o.stock, -1)) AS stock,
-          o.valid_until AS valid_until
-        ORDER BY o.title ASC
-        """,
-        bid=business_id,
-        today=today_iso,
+
+def _recent_scan(key: Tuple[str, str]) -> Optional["QRScanOffersResponse"]:
+    hit = _recent_scans.get(key)
+    if hit is None or hit[0] < time.monotonic():
+        return None
+    return hit[1]
+
+
+def _remember_scan(key: Tuple[str, str], resp: "QRScanOffersResponse") -> "QRScanOffersResponse":
+    now = time.monotonic()
+    if len(_recent_scans) > 10_000:
+        for k in [k for k, (exp, _) in _recent_scans.items() if exp < now]:
+            _recent_scans.pop(k, None)
+    _recent_scans[key] = (now + SCAN_IDEMPOTENCY_TTL_S, resp)
+    return resp
+
+
+def _fails_geofence(meta: DBQRMeta, payload: ClaimRequest) -> bool:
+    """Optional geofence check (only if both sides have coordinates + radius)."""
+    return bool(
+        not DISABLE_GEOFENCE
+        and meta.rules_geofence_radius_m
+        and payload.lat is not None
+        and payload.lng is not None
+        and meta.lat is not None
+        and meta.lng is not None
+        and _outside_radius(payload.lat, payload.lng, meta.lat, meta.lng, float(meta.rules_geofence_radius_m))
     )
 
-    out: List[Dict[str, Any]] = []
-    for r in recs:
-        out.append(
-            {
-                "id": r["id"],
-                "title": r["title"],
-                "blurb": r.get("blurb"),
-                "eco_price": int(r["eco_price"] or 0),
-                "stock": int(r["stock"]) if r.get("stock") is not None and int(r["stock"]) >= 0 else None,
-                "valid_until": r.get("valid_until"),
-            }
-        )
-    return out
 
+def _geofence_response(meta: DBQRMeta, balance: int) -> QRScanOffersResponse:
+    # Not remembered as a recent scan: a retry from a fresh GPS fix should be re-evaluated.
+    return QRScanOffersResponse.model_construct(
+        ok=False,
+        reason="geofence",
+        business_id=meta.business_id,
+        business_name=meta.business_name,
+        location_name=meta.location_name,
+        balance=balance,
+        offers=[],
+    )
 
 
 # ---------- Primary endpoint: QR scan → offers ----------
 
 @router.post("/qr/{code}/offers", response_model=QRScanOffersResponse)
-def qr_scan_offers(
+async def qr_scan_offers(
     code: str,
     req: Request,
     payload: ClaimRequest = Body(...),
     user_id: str = Depends(current_user_id),  # 👈 must be a logged-in youth
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
     """
     Scanning a QR does NOT mint ECO.
@@ -259,41 +351,42 @@ def qr_scan_offers(
            - business balances/sponsor updated
            - ECO retired (BURN_REWARD)
     """
-    meta = _fetch_qr_meta(s, code)
-    if not meta or not meta.active:
+    idem_key = (user_id, code)
+    cached = _recent_scan(idem_key)
+    cached_balance = balance_cache.get(user_id)
+    # A redeem in between moves the balance (and can_claim flags): re-run then.
+    if cached is not None and (cached_balance is None or cached.balance == cached_balance):
+        return cached
+
+    # Cached meta answers inactive QRs and, with a warm balance, geofence
+    # rejects without touching the DB.
+    meta = _cached_qr_meta(code)
+    if meta is not None and not meta.active:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="QR not found or inactive")
+    if meta is not None and cached_balance is not None and _fails_geofence(meta, payload):
+        return _geofence_response(meta, cached_balance)
 
-    # Offer-wallet balance for this authenticated youth
-    balance = _wallet_balance_for_offers(s, user_id)
-
-       # Optional geofence check (only if both sides have coordinates + radius)
-    if (
-        not DISABLE_GEOFENCE
-        and meta.rules_geofence_radius_m
-        and payload.lat is not None
-        and payload.lng is not None
-        and meta.lat is not None
-        and meta.lng is not None
-    ):
-        dist = _haversine_m(payload.lat, payload.lng, meta.lat, meta.lng)
-        if dist > float(meta.rules_geofence_radius_m):
-            return QRScanOffersResponse(
-                ok=False,
-                reason="geofence",
-                business_id=meta.business_id,
-                business_name=meta.business_name,
-                location_name=meta.location_name,
-                balance=balance,
-                offers=[],
-            )
+    # A warm per-worker balance lets the fused read skip the wallet part.
+    meta, balance, offers_raw = await _fetch_scan_view(
+        s, code, None if cached_balance is not None else user_id
+    )
+    if meta is not None:
+        _remember_qr_meta(meta)
+    if not meta or not meta.active:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="QR not found or inactive")
+    if cached_balance is not None:
+        balance = cached_balance
+    else:
+        balance_cache.put(user_id, balance)
 
+    if _fails_geofence(meta, payload):
+        return _geofence_response(meta, balance)
 
-    offers_raw = _active_offers_for_business(s, meta.business_id)
     offers_out: List[ClaimableOffer] = []
     for o in offers_raw:
         eco_price = int(o["eco_price"] or 0)
         offers_out.append(
-            ClaimableOffer(
+            ClaimableOffer.model_construct(
                 id=o["id"],
                 title=o["title"] or "",
                 blurb=o.get("blurb"),
@@ -305,11 +398,11 @@ def qr_scan_offers(
         )
 
 
-    return QRScanOffersResponse(
+    return _remember_scan(idem_key, QRScanOffersResponse.model_construct(
         ok=True,
         business_id=meta.business_id,
         business_name=meta.business_name,
         location_name=meta.location_name,
         balance=balance,
         offers=offers_out,
-    )
+    ))
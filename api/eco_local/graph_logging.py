@@ -1,9 +1,9 @@
 # api/services/graph_logging.py
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
 from neo4j import Session
@@ -21,7 +21,7 @@ class ClaimTx:
     lng: Optional[float] = None
     device_hash: Optional[str] = None
     method: str = "qr"  # "qr" | "nfc" | "impact"
-    ts: datetime = datetime.now(timezone.utc)
+    ts: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     tx_id: str = ""
 
     def ensure_id(self):
@@ -29,20 +29,9 @@ class ClaimTx:
             self.tx_id = f"tx_{uuid4().hex[:16]}"
         return self
 
-def log_eco_local_claim(session: Session, claim: ClaimTx) -> str:
-    """
-    Canonical logging into the unified EcoTx ledger.
-
-    - Creates (EcoTx { amount, kind, source, status, createdAt, at, device_id, qr_code })
-    - Links (User)-[:EARNED]->(EcoTx)<-[:TRIGGERED]-(BusinessProfile)
-    - Optionally links (EcoTx)-[:AT]->(BusinessLocation)
-    - Rolls simple counters safely (no duplicate increments on re-run).
-    """
+def _claim_params(claim: ClaimTx) -> Dict[str, Any]:
     claim.ensure_id()
-    at_iso = claim.ts.isoformat()
-    created_ms = int(claim.ts.timestamp() * 1000)
-
-    params = {
+    return {
         "tx_id": claim.tx_id,
         "uid": claim.user_id,
         "bid": claim.business_id,
@@ -55,10 +44,21 @@ def log_eco_local_claim(session: Session, claim: ClaimTx) -> str:
         "device": claim.device_hash,
         "method": claim.method,
         "code": claim.qr_code,
-        "at": at_iso,
-        "created_ms": created_ms,
+        "at": claim.ts.isoformat(),
+        "created_ms": int(claim.ts.timestamp() * 1000),
     }
 
+def log_eco_local_claim(session: Session, claim: ClaimTx) -> str:
+    """
+    Canonical logging into the unified EcoTx ledger.
+
+    - Creates (EcoTx { amount, kind, source, status, createdAt, at, device_id, qr_code })
+    - Links (User)-[:EARNED]->(EcoTx)<-[:TRIGGERED]-(BusinessProfile)
+    - Optionally links (EcoTx)-[:AT]->(BusinessLocation)
+    - Rolls simple counters safely (no duplicate increments on re-run).
+    """
+    params = _claim_params(claim)
+
     cypher = """
     // Entities
     MERGE (u:User {id:$uid})
@@ -121,3 +121,51 @@ def log_eco_local_claim(session: Session, claim: ClaimTx) -> str:
 
     rec = session.run(cypher, params).single()
     return rec["tx_id"] if rec else claim.tx_id
+
+_LOG_CLAIMS_BATCH_Q = """
+UNWIND $rows AS r
+MERGE (u:User {id:r.uid})
+MERGE (b:BusinessProfile {id:r.bid})
+  ON CREATE SET b.name = coalesce(r.bname, r.bid)
+  ON MATCH  SET b.name = coalesce(r.bname, b.name)
+FOREACH (_ IN CASE WHEN r.loc_id IS NOT NULL THEN [1] ELSE [] END |
+  MERGE (l:BusinessLocation {id: r.loc_id})
+    ON CREATE SET l.name = coalesce(r.loc_name, r.loc_id), l.lat = r.lat, l.lng = r.lng
+    ON MATCH  SET l.name = coalesce(r.loc_name, l.name)
+  MERGE (l)-[:OF]->(b)
+)
+MERGE (t:EcoTx {id:r.tx_id})
+  ON CREATE SET
+    t.amount     = r.eco,
+    t.kind       = "scan",
+    t.method     = r.method,
+    t.source     = "eco-local",
+    t.status     = "settled",
+    t.createdAt  = r.created_ms,
+    t.at         = datetime(r.at),
+    t.qr_code    = r.code,
+    t.device_id  = r.device
+  ON MATCH SET
+    t.amount     = coalesce(t.amount, r.eco)
+MERGE (u)-[:EARNED]->(t)
+MERGE (b)-[:TRIGGERED]->(t)
+WITH t, r
+OPTIONAL MATCH (l:BusinessLocation {id: r.loc_id})
+FOREACH (_ IN CASE WHEN l IS NULL THEN [] ELSE [1] END |
+  MERGE (t)-[:AT]->(l)
+)
+RETURN t.id AS tx_id
+"""
+
+def log_eco_local_claims(session: Session, claims: List[ClaimTx]) -> List[str]:
+    """
+    Batch form of log_eco_local_claim (kiosk / festival bursts): same ledger shape,
+    one UNWIND statement in a single retryable write transaction.
+    """
+    if not claims:
+        return []
+    rows = [_claim_params(c) for c in claims]
+    session.execute_write(
+        lambda tx: tx.run(_LOG_CLAIMS_BATCH_Q, rows=rows).consume()
+    )
+    return [r["tx_id"] for r in rows]
@@ -1,17 +1,22 @@
 # api/routers/eco-local_impact.py
 from __future__ import annotations
-from typing import Optional, Dict, Any, List
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+import threading
+import time
+from hashlib import blake2b
+from typing import Optional, Dict, Any, List, Tuple
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 from neo4j import Session
 
 from site_backend.core.neo_driver import session_dep
-from site_backend.core.user_guard import current_user_id
 from api.services.impact import (
-    IMPACT_EVENTS,
-    upsert_impact_inputs, compute_and_store_bis, enable_events_for_business, record_scan_mint
+    BUSINESS_BURST_MAX, IMPACT_EVENTS, IdempotencyConflict,
+    upsert_impact_inputs, compute_and_store_bis, enable_events_for_business, record_scan_mint,
+    record_scan_mints,
 )
-from .onboard import _resolve_user_business_id
+from .neo_business import forget_business_metrics
+from .onboard import resolved_business_id_sync
 
 router = APIRouter(prefix="/eco-local/impact", tags=["impact"])
 
@@ -31,18 +36,67 @@ class ScanIn(BaseModel):
     evidence: Optional[Dict[str, Any]] = None
     device_id: Optional[str] = None
 
+class ScanBatchIn(BaseModel):
+    # The business burst guard (BUSINESS_BURST_MAX mints per burst window) applies
+    # to batches too, so a batch can never mint more than that; larger bodies 422.
+    scans: List[ScanIn] = Field(..., min_length=1, max_length=BUSINESS_BURST_MAX)
+
+# ----- Idempotency -----
+# Clients may send an Idempotency-Key on scan / scan:batch / enable_events. The
+# durable guard is in Neo4j: mint tx ids are derived from (business, op, key), so
+# a retry on any worker lands on the same EcoTx. This per-worker map only
+# short-circuits repeats seen here; the key is bound to a payload fingerprint and
+# reusing it for a different payload is a 409. Only ok responses are kept, so a
+# retry after a rejected scan (cooldown, cap) is evaluated again.
+IDEMPOTENCY_TTL_S = 24 * 3600.0
+_IDEMPOTENCY_MAX = 10_000
+_idem_lock = threading.Lock()
+_idem_responses: Dict[Tuple[str, str, str], Tuple[float, str, Dict[str, Any]]] = {}
+
+def _fingerprint(payload: BaseModel) -> str:
+    return blake2b(orjson.dumps(payload.model_dump(), option=orjson.OPT_SORT_KEYS), digest_size=8).hexdigest()
+
+def _replayed(key: Optional[Tuple[str, str, str]], fp: str) -> Optional[Dict[str, Any]]:
+    if key is None:
+        return None
+    hit = _idem_responses.get(key)
+    if hit is None or hit[0] < time.monotonic():
+        return None
+    if hit[1] != fp:
+        raise HTTPException(status_code=409, detail="Idempotency-Key reused with a different payload")
+    return hit[2]
+
+def _remember(key: Optional[Tuple[str, str, str]], fp: str, resp: Dict[str, Any]) -> Dict[str, Any]:
+    if key is None or not resp.get("ok"):
+        return resp
+    now = time.monotonic()
+    with _idem_lock:
+        if len(_idem_responses) >= _IDEMPOTENCY_MAX:
+            for k in [k for k, (exp, _, _) in _idem_responses.items() if exp < now]:
+                _idem_responses.pop(k, None)
+            # Still full: drop the oldest entries (dicts keep insertion order).
+            for k in list(_idem_responses)[: len(_idem_responses) - _IDEMPOTENCY_MAX + 1]:
+                _idem_responses.pop(k, None)
+        _idem_responses[key] = (now + IDEMPOTENCY_TTL_S, fp, resp)
+    return resp
+
+# The catalog is static per deploy: encode it once and let clients revalidate.
+_EVENTS_JSON = orjson.dumps(IMPACT_EVENTS)
+_EVENTS_ETAG = f'"{blake2b(_EVENTS_JSON, digest_size=8).hexdigest()}"'
+_EVENTS_HEADERS = {"ETag": _EVENTS_ETAG, "Cache-Control": "public, max-age=300"}
+
 @router.get("/events", response_model=Dict[str, Dict[str, Any]])
-def list_event_catalog():
-    return IMPACT_EVENTS
+def list_event_catalog(req: Request):
+    if req.headers.get("if-none-match") == _EVENTS_ETAG:
+        return Response(status_code=304, headers=_EVENTS_HEADERS)
+    return Response(content=_EVENTS_JSON, media_type="application/json", headers=_EVENTS_HEADERS)
 
 @router.post("/inputs", response_model=dict)
 def submit_impact_inputs(
     payload: ImpactInputs,
     s: Session = Depends(session_dep),
-    user_id: str = Depends(current_user_id),
-    business_id: Optional[str] = Query(None),
+    bid: str = Depends(resolved_business_id_sync),
 ):
-    bid = _resolve_user_business_id(s, user_id, business_id)
     upsert_impact_inputs(
         s, business_id=bid,
         practices=payload.practices,
@@ -57,21 +111,29 @@ def submit_impact_inputs(
 def enable_events(
     payload: EnableEventsIn,
     s: Session = Depends(session_dep),
-    user_id: str = Depends(current_user_id),
-    business_id: Optional[str] = Query(None),
+    bid: str = Depends(resolved_business_id_sync),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
-    bid = _resolve_user_business_id(s, user_id, business_id)
-    return enable_events_for_business(s, business_id=bid, event_keys=payload.event_keys)
+    key = (bid, "enable_events", idempotency_key) if idempotency_key else None
+    fp = _fingerprint(payload)
+    cached = _replayed(key, fp)
+    if cached is not None:
+        return cached
+    return _remember(key, fp, enable_events_for_business(s, business_id=bid, event_keys=payload.event_keys))
 
 @router.post("/scan", response_model=dict)
 def scan_and_mint(
     req: Request,
     payload: ScanIn,
     s: Session = Depends(session_dep),
-    user_id: str = Depends(current_user_id),  # business or staff device can call; youth id is payload
-    business_id: Optional[str] = Query(None),
+    bid: str = Depends(resolved_business_id_sync),  # business or staff device can call; youth id is payload
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
-    bid = _resolve_user_business_id(s, user_id, business_id)
+    key = (bid, "scan", idempotency_key) if idempotency_key else None
+    fp = _fingerprint(payload)
+    cached = _replayed(key, fp)
+    if cached is not None:
+        return cached
     try:
         out = record_scan_mint(
             s,
@@ -81,9 +143,47 @@ def scan_and_mint(
             evidence=payload.evidence,
             client_ip=req.client.host if req.client else None,
             device_id=payload.device_id,
+            idempotency_key=idempotency_key,
         )
-        return out
+        if out.get("ok"):
+            forget_business_metrics(bid)
+        return _remember(key, fp, out)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except PermissionError as e:
         raise HTTPException(status_code=403, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/scan:batch", response_model=dict)
+def scan_and_mint_batch(
+    req: Request,
+    payload: ScanBatchIn,
+    s: Session = Depends(session_dep),
+    bid: str = Depends(resolved_business_id_sync),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    """
+    Kiosk mode: up to BUSINESS_BURST_MAX scans in two round trips; per-scan
+    results in request order. Rows past the remaining burst budget (e.g. a batch
+    right after other scans) come back as "business_burst".
+    """
+    key = (bid, "scan:batch", idempotency_key) if idempotency_key else None
+    fp = _fingerprint(payload)
+    cached = _replayed(key, fp)
+    if cached is not None:
+        return cached
+    try:
+        results = record_scan_mints(
+            s,
+            business_id=bid,
+            scans=[sc.model_dump() for sc in payload.scans],
+            client_ip=req.client.host if req.client else None,
+            idempotency_key=idempotency_key,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if any(r.get("ok") for r in results):
+        forget_business_metrics(bid)
+    return _remember(key, fp, {"ok": True, "business_id": bid, "results": results})
@@ -1,7 +1,7 @@
 # api/services/graph_logging.py
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional
 from uuid import uuid4
@@ -22,7 +22,7 @@ class ClaimTx:
     lng: Optional[float] = None
     device_hash: Optional[str] = None
     method: str = "qr"  # or "nfc"
-    ts: datetime = datetime.now(timezone.utc)
+    ts: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     tx_id: str = ""
 
     def ensure_id(self):
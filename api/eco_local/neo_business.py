@@ -1,18 +1,54 @@
 # site_backend/api/eco_local/neo_business.py
 from __future__ import annotations
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from uuid import uuid4
-from datetime import datetime, timezone, timedelta
-from neo4j import Session
+from time import time_ns
+from neo4j import AsyncManagedTransaction, AsyncSession, Session
 
 # ---------- helpers ----------
 def new_id(prefix: str) -> str:
     return f"{prefix}_{uuid4().hex[:12]}"
 
 def _now_ms() -> int:
-    return int(datetime.now(timezone.utc).timestamp() * 1000)
+    return time_ns() // 1_000_000
 
 # ---------- standards ----------
+_UPDATE_STANDARDS_Q = """
+MATCH (b:BusinessProfile {id:$bid})
+SET b.standards_eco            = $standards_eco,
+    b.standards_sustainability = $standards_sustainability,
+    b.standards_social         = $standards_social,
+    b.certifications           = $certifications,
+    b.links                    = $links
+RETURN {
+  id: b.id,
+  standards_eco: b.standards_eco,
+  standards_sustainability: b.standards_sustainability,
+  standards_social: b.standards_social,
+  certifications: b.certifications,
+  links: b.links
+} AS out
+"""
+
+def _standards_params(
+    business_id: str,
+    standards_eco: str,
+    standards_sustainability: str,
+    standards_social: str,
+    certifications: Optional[List[str]],
+    links: Optional[List[str]],
+) -> Dict[str, Any]:
+    return {
+        "bid": business_id,
+        "standards_eco": standards_eco.strip(),
+        "standards_sustainability": standards_sustainability.strip(),
+        "standards_social": standards_social.strip(),
+        "certifications": certifications or [],
+        "links": links or [],
+    }
+
 def business_update_standards(
     s: Session,
     *,
@@ -24,34 +60,90 @@ def business_update_standards(
     links: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     rec = s.run(
-        """
-        MATCH (b:BusinessProfile {id:$bid})
-        SET b.standards_eco            = $standards_eco,
-            b.standards_sustainability = $standards_sustainability,
-            b.standards_social         = $standards_social,
-            b.certifications           = $certifications,
-            b.links                    = $links
-        RETURN {
-          id: b.id,
-          standards_eco: b.standards_eco,
-          standards_sustainability: b.standards_sustainability,
-          standards_social: b.standards_social,
-          certifications: b.certifications,
-          links: b.links
-        } AS out
-        """,
-        bid=business_id,
-        standards_eco=standards_eco.strip(),
-        standards_sustainability=standards_sustainability.strip(),
-        standards_social=standards_social.strip(),
-        certifications=certifications or [],
-        links=links or [],
+        _UPDATE_STANDARDS_Q,
+        _standards_params(
+            business_id, standards_eco, standards_sustainability,
+            standards_social, certifications, links,
+        ),
     ).single()
     if not rec:
         raise ValueError("Business not found")
     return rec["out"]
 
+async def business_update_standards_async(
+    s: AsyncSession,
+    *,
+    business_id: str,
+    standards_eco: str,
+    standards_sustainability: str,
+    standards_social: str,
+    certifications: Optional[List[str]] = None,
+    links: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    res = await s.run(
+        _UPDATE_STANDARDS_Q,
+        _standards_params(
+            business_id, standards_eco, standards_sustainability,
+            standards_social, certifications, links,
+        ),
+    )
+    rec = await res.single()
+    if not rec:
+        raise ValueError("Business not found")
+    return rec["out"]
+
 # ---------- business setup / profile ----------
+# Canonical rule: one BusinessProfile per user.
+# Key by (user_id) and ensure an (id) on first create.
+# Also ensure OWNS and a QR code.
+_BUSINESS_INIT_Q = """
+// Ensure the user
+MERGE (u:User {id:$user_id})
+
+// Single business per user - key by user_id
+MERGE (b:BusinessProfile {user_id:$user_id})
+  ON CREATE SET
+    b.id             = randomUUID(),
+    b.created_at     = datetime(),
+    b.visible_on_map = true,
+    // initialize common public fields to avoid warnings
+    b.website='', b.tagline='', b.address='', b.hours='', b.description='',
+    b.hero_url='', b.tags=[],
+    b.eco_contributed_total=0, b.eco_given_total=0, b.minted_eco=0
+
+// Always keep latest provided props up to date
+SET b.name           = $name,
+    b.industry_group = $industry_group,
+    b.size           = $size,
+    b.area           = $area,
+    b.pledge_tier    = $pledge_tier,
+    b.eco_mint_ratio = 1,
+    // onboarding stays open until /business/onboarding_complete (idempotent)
+    b.onboarding_completed = coalesce(b.onboarding_completed, false)
+
+MERGE (u)-[:OWNS]->(b)
+
+WITH b
+MERGE (q:QR {code:$qr_code})
+MERGE (q)-[:OF]->(b)
+ON CREATE SET q.created_at = datetime()
+
+RETURN b.id AS business_id, q.code AS qr_code
+"""
+
+def _init_params(
+    user_id: str, business_name: str, industry_group: str, size: str, area: str, pledge_tier: str
+) -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "name": business_name.strip(),
+        "industry_group": industry_group.strip(),
+        "size": size.strip(),
+        "area": area.strip(),
+        "pledge_tier": pledge_tier.strip(),
+        "qr_code": f"biz_{uuid4().hex[:10]}",
+    }
+
 def business_init(
     s: Session,
     *,
@@ -62,57 +154,26 @@ def business_init(
     area: str,
     pledge_tier: str,
 ) -> Dict[str, Any]:
-    """
-    Canonical rule: one BusinessProfile per user.
-    Key by (user_id) and ensure an (id) on first create.
-    Also ensure OWNS and a QR code.
-    """
-    qr_code = f"biz_{uuid4().hex[:10]}"
-
-    rec = s.run(
-        """
-        // Ensure the user
-        MERGE (u:User {id:$user_id})
+    params = _init_params(user_id, business_name, industry_group, size, area, pledge_tier)
+    rec = s.execute_write(lambda tx: tx.run(_BUSINESS_INIT_Q, params).single())
+    return {"business_id": rec["business_id"], "qr_code": rec["qr_code"]}
 
-        // Single business per user - key by user_id
-        MERGE (b:BusinessProfile {user_id:$user_id})
-          ON CREATE SET
-            b.id             = randomUUID(),
-            b.created_at     = datetime(),
-            b.visible_on_map = true,
-            // initialize common public fields to avoid warnings
-            b.website='', b.tagline='', b.address='', b.hours='', b.description='',
-            b.hero_url='', b.tags=[],
-            b.eco_contributed_total=0, b.eco_given_total=0, b.minted_eco=0
-
-        // Always keep latest provided props up to date
-        SET b.name           = $name,
-            b.industry_group = $industry_group,
-            b.size           = $size,
-            b.area           = $area,
-            b.pledge_tier    = $pledge_tier,
-            b.eco_mint_ratio = 1
-
-        MERGE (u)-[:OWNS]->(b)
-
-        WITH b
-        MERGE (q:QR {code:$qr_code})
-        MERGE (q)-[:OF]->(b)
-        ON CREATE SET q.created_at = datetime()
-
-        RETURN b.id AS business_id, q.code AS qr_code
-        """,
-        {
-            "user_id": user_id,
-            "name": business_name.strip(),
-            "industry_group": industry_group.strip(),
-            "size": size.strip(),
-            "area": area.strip(),
-            "pledge_tier": pledge_tier.strip(),
-            "qr_code": qr_code,
-        },
-    ).single()
+async def _tx_business_init(tx: AsyncManagedTransaction, params: Dict[str, Any]):
+    res = await tx.run(_BUSINESS_INIT_Q, params)
+    return await res.single()
 
+async def business_init_async(
+    s: AsyncSession,
+    *,
+    user_id: str,
+    business_name: str,
+    industry_group: str,
+    size: str,
+    area: str,
+    pledge_tier: str,
+) -> Dict[str, Any]:
+    params = _init_params(user_id, business_name, industry_group, size, area, pledge_tier)
+    rec = await s.execute_write(_tx_business_init, params)
     return {"business_id": rec["business_id"], "qr_code": rec["qr_code"]}
 
 def business_by_owner(s: Session, *, user_id: str) -> Optional[Dict[str, Any]]:
@@ -161,21 +222,19 @@ def business_update_public_profile(
     if not clean:
         raise ValueError("No valid fields provided")
 
-    sets = ", ".join([f"b.{k} = ${k}" for k in clean.keys()])
-
     rec = s.run(
-        f"""
-        MATCH (u:User {{id:$uid}})-[r]->(b:BusinessProfile {{id:$bid}})
+        """
+        MATCH (u:User {id:$uid})-[r]->(b:BusinessProfile {id:$bid})
         WHERE type(r) IN ['OWNS','MANAGES']
-        SET {sets}
-        RETURN {{
+        SET b += $fields
+        RETURN {
           id:b.id, name:b.name, tagline:b.tagline, website:b.website, address:b.address,
           hours:b.hours, description:b.description, hero_url:b.hero_url,
           lat:b.lat, lng:b.lng, visible_on_map:coalesce(b.visible_on_map,true),
           tags: coalesce(b.tags, [])
-        }} AS out
+        } AS out
         """,
-        uid=owner_user_id, bid=business_id, **clean
+        uid=owner_user_id, bid=business_id, fields=clean
     ).single()
     if not rec:
         raise PermissionError("Not owner/manager or business not found")
@@ -188,18 +247,11 @@ def stripe_record_contribution(
     business_id: str,
     aud_cents: int,
 ) -> Dict[str, Any]:
-    rec = s.run(
-        "MATCH (b:BusinessProfile {id:$bid}) RETURN b.id AS bid",
-        bid=business_id,
-    ).single()
-    if not rec:
-        raise ValueError("Business not found")
-
     aud = int(aud_cents) / 100.0
     eco = int(round(aud * 1))  # 1:1
     tx_id = new_id("eco_tx")
 
-    s.run(
+    rec = s.execute_write(lambda tx: tx.run(
         """
         MATCH (b:BusinessProfile {id:$bid})
         MERGE (t:EcoTx {id:$tx_id})
@@ -213,30 +265,61 @@ def stripe_record_contribution(
         MERGE (b)-[:TRIGGERED]->(t)
         SET b.eco_contributed_total = coalesce(b.eco_contributed_total,0) + $eco,
             b.minted_eco            = coalesce(b.minted_eco,0) + $eco
+        RETURN b.id AS bid
         """,
         bid=business_id, tx_id=tx_id, eco=eco, now=_now_ms(),
-    )
+    ).single())
+    if not rec:
+        raise ValueError("Business not found")
+    forget_business_metrics(business_id)
     return {"ok": True, "tx_id": tx_id, "eco": eco, "business_id": business_id}
 
 # ---------- metrics & activity ----------
+# Business-side reads use t.amount directly; every TRIGGERED writer stores an
+# int amount, and backfill_ecotx_amounts() normalises legacy eco-only rows.
+def backfill_ecotx_amounts(s: Session) -> Dict[str, Any]:
+    """One-off / repair job: set EcoTx.amount from legacy EcoTx.eco where missing."""
+    s.run(
+        """
+        MATCH (t:EcoTx)
+        WHERE t.amount IS NULL AND t.eco IS NOT NULL
+        CALL {
+          WITH t
+          SET t.amount = toInteger(t.eco)
+        } IN TRANSACTIONS OF 10000 ROWS
+        """
+    ).consume()
+    rec = s.run(
+        "MATCH (t:EcoTx) WHERE t.amount IS NULL AND t.eco IS NOT NULL RETURN count(t) AS left"
+    ).single()
+    return {"ok": True, "remaining": int(rec["left"]) if rec else 0}
+
+# Dashboards poll metrics; the 30d velocity scan is served from a short
+# per-worker cache. Contributions and scan mints recorded in this worker drop
+# the entry.
+_METRICS_TTL_S = 30.0
+_metrics_lock = threading.Lock()
+_metrics_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+def forget_business_metrics(business_id: str) -> None:
+    with _metrics_lock:
+        _metrics_cache.pop(business_id, None)
+
 def get_business_metrics(s: Session, *, business_id: str) -> Dict[str, Any]:
+    hit = _metrics_cache.get(business_id)
+    if hit is not None and hit[0] > time.monotonic():
+        return dict(hit[1])
     rec = s.run(
         """
         MATCH (b:BusinessProfile {id:$bid})
+        // txs without createdAt count as "now", as before
         OPTIONAL MATCH (b)-[:TRIGGERED]->(t:EcoTx)
-        WITH b, collect(t) AS txs
-        WITH b, [x IN txs WHERE x IS NOT NULL |
-            {
-              amt: toInteger(coalesce(x.amount, x.eco, 0)),
-              created: toInteger(coalesce(x.createdAt, timestamp()))
-            }
-        ] AS sane
-        WITH b,
+        WHERE t.createdAt >= timestamp() - 2592000000 OR t.createdAt IS NULL  // 30d
+        WITH b, coalesce(sum(t.amount), 0) AS last30
+        WITH b, last30,
              coalesce(b.eco_contributed_total,0) AS contributed,
              coalesce(b.eco_given_total,0)       AS given,
-             coalesce(b.minted_eco,0)            AS total,
-             [p IN sane WHERE p.created >= $since_ms | p.amt] AS recent
-        WITH b, contributed, given, total, reduce(s=0, x IN recent | s + x) AS last30
+             coalesce(b.minted_eco,0)            AS total
         RETURN {
           business_id: b.id,
           name: b.name,
@@ -249,41 +332,66 @@ def get_business_metrics(s: Session, *, business_id: str) -> Dict[str, Any]:
         } AS out
         """,
         bid=business_id,
-        since_ms=int((datetime.now(timezone.utc) - timedelta(days=30)).timestamp() * 1000),
     ).single()
     if not rec:
         raise ValueError("Business not found")
-    return rec["out"]
+    out = rec["out"]
+    with _metrics_lock:
+        _metrics_cache[business_id] = (time.monotonic() + _METRICS_TTL_S, out)
+    return dict(out)
+
+_ACTIVITY_Q = """
+MATCH (b:BusinessProfile {id:$bid})-[:TRIGGERED]->(t:EcoTx)
+WHERE $before IS NULL OR t.createdAt < $before
+OPTIONAL MATCH (u:User)-[:EARNED]->(t)
+WITH t, u,
+     toInteger(coalesce(t.createdAt, timestamp())) AS created_ms,
+     coalesce(t.amount, 0)                         AS amt,
+     coalesce(t.kind, 'scan')                      AS knd,
+     coalesce(t.source, 'eco_local')               AS src
+RETURN {
+  id: t.id,
+  kind: knd,
+  source: src,
+  amount: amt,
+  createdAt: created_ms,
+  user_id: u.id
+} AS row
+ORDER BY created_ms DESC
+LIMIT $lim
+"""
+
+def iter_business_activity(
+    s: Session, *, business_id: str, limit: int = 50, before_ms: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield activity rows as the driver streams records (no intermediate .data() list)."""
+    limit = max(1, min(int(limit or 50), 200))
+    for record in s.run(_ACTIVITY_Q, bid=business_id, lim=limit, before=before_ms):
+        yield record["row"]
 
 def get_business_activity(
-    s: Session, *, business_id: str, limit: int = 50
+    s: Session, *, business_id: str, limit: int = 50, before_ms: Optional[int] = None
 ) -> List[Dict[str, Any]]:
-    limit = max(1, min(int(limit or 50), 200))
-    rows = s.run(
-        """
-        MATCH (b:BusinessProfile {id:$bid})-[:TRIGGERED]->(t:EcoTx)
-        OPTIONAL MATCH (u:User)-[:EARNED]->(t)
-        WITH t, u,
-             toInteger(coalesce(t.createdAt, timestamp())) AS created_ms,
-             toInteger(coalesce(t.amount, t.eco, 0))      AS amt,
-             coalesce(t.kind, 'scan')                      AS knd,
-             coalesce(t.source, 'eco_local')               AS src
-        RETURN {
-          id: t.id,
-          kind: knd,
-          source: src,
-          amount: amt,
-          createdAt: created_ms,
-          user_id: u.id
-        } AS row
-        ORDER BY created_ms DESC
-        LIMIT $lim
-        """,
-        bid=business_id, lim=limit
-    ).data() or []
-    return [r["row"] for r in rows]
+    """Newest-first; pass the last row's createdAt as before_ms for the next page."""
+    return list(iter_business_activity(s, business_id=business_id, limit=limit, before_ms=before_ms))
 
 # ---------- offers ----------
+# o.tags stays the source of truth for readers; (:Offer)-[:TAGGED]->(:Tag) mirrors
+# it so "offers with tag X" is an index seek. Splice in after any write to o.tags
+# (expects `o` in scope; leaves only `o`).
+OFFER_TAGS_SYNC = """
+WITH o
+CALL {
+  WITH o
+  OPTIONAL MATCH (o)-[r:TAGGED]->(:Tag)
+  DELETE r
+}
+FOREACH (tname IN coalesce(o.tags, []) |
+  MERGE (tag:Tag {name: tname})
+  MERGE (o)-[:TAGGED]->(tag)
+)
+"""
+
 def create_offer(
     s: Session, *, business_id: str, title: str, blurb: str,
     offtype: str, visible: bool, redeem_eco: Optional[int],
@@ -291,7 +399,7 @@ def create_offer(
     tags: Optional[List[str]]
 ) -> Dict[str, Any]:
     oid = new_id("off")
-    rec = s.run(
+    rec = s.execute_write(lambda tx: tx.run(
         """
         MATCH (b:BusinessProfile {id:$bid})
         CREATE (o:Offer {
@@ -300,39 +408,84 @@ def create_offer(
           createdAt:timestamp()
         })
         MERGE (o)-[:OF]->(b)
+        """ + OFFER_TAGS_SYNC + """
         RETURN o
         """,
         bid=business_id, oid=oid, title=title.strip(), blurb=blurb.strip(),
         type=offtype, visible=bool(visible), redeem_eco=redeem_eco,
         url=url, valid_until=valid_until, tags=tags or [],
-    ).single()
+    ).single())
     if not rec:
         raise ValueError("Business not found")
     return rec["o"]
 
-def list_offers(s: Session, *, business_id: str, visible_only: bool) -> List[Dict[str, Any]]:
+_LIST_OFFERS_Q = """
+MATCH (b:BusinessProfile {id:$bid})<-[:OF]-(o:Offer)
+WHERE $visible_only = false OR coalesce(o.visible,true) = true
+RETURN o
+ORDER BY coalesce(o.valid_until, date("2999-12-31")) ASC, o.createdAt ASC
+"""
+
+_LIST_OFFERS_BY_TAG_Q = """
+MATCH (:Tag {name:$tag})<-[:TAGGED]-(o:Offer)-[:OF]->(b:BusinessProfile {id:$bid})
+WHERE $visible_only = false OR coalesce(o.visible,true) = true
+RETURN o
+ORDER BY coalesce(o.valid_until, date("2999-12-31")) ASC, o.createdAt ASC
+"""
+
+def list_offers(
+    s: Session, *, business_id: str, visible_only: bool, tag: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    q = _LIST_OFFERS_BY_TAG_Q if tag else _LIST_OFFERS_Q
     return [
-        r["o"] for r in s.run(
-            """
-            MATCH (b:BusinessProfile {id:$bid})<-[:OF]-(o:Offer)
-            WHERE $visible_only = false OR coalesce(o.visible,true) = true
-            RETURN o
-            ORDER BY coalesce(o.valid_until, date("2999-12-31")) ASC, o.createdAt ASC
-            """,
-            bid=business_id, visible_only=visible_only
-        )
+        r["o"] for r in s.run(q, bid=business_id, visible_only=visible_only, tag=tag)
     ]
 
+async def list_offers_async(
+    s: AsyncSession, *, business_id: str, visible_only: bool, tag: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    q = _LIST_OFFERS_BY_TAG_Q if tag else _LIST_OFFERS_Q
+    res = await s.run(q, bid=business_id, visible_only=visible_only, tag=tag)
+    return [r["o"] async for r in res]
+
+def backfill_offer_tags(s: Session) -> Dict[str, Any]:
+    """One-off / repair job: mirror every Offer's o.tags into TAGGED edges."""
+    rec = s.run(
+        """
+        MATCH (o:Offer)
+        WHERE size(coalesce(o.tags, [])) > 0
+        """ + OFFER_TAGS_SYNC + """
+        RETURN count(o) AS offers
+        """
+    ).single()
+    return {"ok": True, "offers": int(rec["offers"]) if rec else 0}
+
+# Patchable Offer properties (both the owner.py and offers.py offer shapes).
+_OFFER_PATCH_ALLOWED = {
+    "title", "blurb", "type", "visible", "redeem_eco", "status", "eco_price",
+    "fiat_cost_cents", "stock", "url", "valid_until", "tags",
+}
+
+_PATCH_OFFER_Q = """
+MATCH (o:Offer {id:$oid})
+SET o += $fields
+""" + OFFER_TAGS_SYNC + """
+RETURN o
+"""
+
 def patch_offer(s: Session, *, offer_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
-    if not fields:
+    clean = {k: v for k, v in fields.items() if k in _OFFER_PATCH_ALLOWED}
+    if not clean:
         rec = s.run("MATCH (o:Offer {id:$oid}) RETURN o", oid=offer_id).single()
         if not rec: raise ValueError("Offer not found")
         return rec["o"]
-    sets = ", ".join([f"o.{k} = ${k}" for k in fields.keys()])
-    params = {"oid": offer_id, **fields}
-    rec = s.run(f"MATCH (o:Offer {{id:$oid}}) SET {sets} RETURN o", **params).single()
+    rec = s.execute_write(
+        lambda tx: tx.run(_PATCH_OFFER_Q, oid=offer_id, fields=clean).single()
+    )
     if not rec: raise ValueError("Offer not found")
     return rec["o"]
 
 def delete_offer(s: Session, *, offer_id: str) -> None:
-    s.run("MATCH (o:Offer {id:$oid}) DETACH DELETE o", oid=offer_id)
+    s.execute_write(
+        lambda tx: tx.run("MATCH (o:Offer {id:$oid}) DETACH DELETE o", oid=offer_id).consume()
+    )
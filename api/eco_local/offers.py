@@ -1,21 +1,23 @@
 # api/routers/offers.py
 from __future__ import annotations
 
-from datetime import date, timedelta, datetime, timezone
+from datetime import date, datetime, timezone
+from time import time_ns
 from typing import List, Optional, Literal, Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from neo4j import Session
+from fastapi.responses import ORJSONResponse
+from neo4j import AsyncSession, Session
 from pydantic import BaseModel, Field
 from uuid import uuid4
 
-from site_backend.core.neo_driver import session_dep
+from site_backend.core.neo_driver import async_session_dep, session_dep
 from site_backend.core.user_guard import current_user_id
+from site_backend.api.eco_local import balance_cache
 from site_backend.api.eco_local.neo_business import (
     create_offer as svc_create_offer,
-    list_offers as svc_list_offers,
+    list_offers_async as svc_list_offers_async,
     patch_offer as svc_patch_offer,
-    delete_offer as svc_delete_offer,
 )
 
 router = APIRouter(prefix="/eco-local", tags=["eco-local"])
@@ -29,7 +31,7 @@ VOUCHER_TTL_MIN = 15  # one-time QR lifetime
 
 
 def now_ms() -> int:
-    return int(datetime.now(tz=timezone.utc).timestamp() * 1000)
+    return time_ns() // 1_000_000
 
 
 def now_iso() -> str:
@@ -40,16 +42,52 @@ def short_code() -> str:
     return uuid4().hex[:10].upper()
 
 
-def _get_user_business_ids(s: Session, user_id: str) -> List[str]:
-    recs = s.run(
-        f"""
-        MATCH (u:User {{id:$uid}})-[{_OWNS_EDGES[0]}]->(b:BusinessProfile)
-        RETURN b.id AS id
-        ORDER BY id
-        """,
-        uid=user_id,
-    )
-    return [r["id"] for r in recs]
+_RESOLVE_BID_Q = f"""
+OPTIONAL MATCH (u:User {{id:$uid}})-[{_OWNS_EDGES[0]}]->(b:BusinessProfile)
+WITH collect(DISTINCT b.id) AS ids
+RETURN ids,
+       CASE WHEN $bid IS NOT NULL AND $bid IN ids THEN $bid
+            WHEN $bid IS NULL AND size(ids) = 1 THEN ids[0]
+       END AS resolved
+"""
+
+_OFFER_OWNER_Q = f"""
+MATCH (u:User {{id:$uid}})-[{_OWNS_EDGES[0]}]->(b:BusinessProfile)<-[:OF]-(o:Offer {{id:$oid}})
+RETURN b.id AS bid
+LIMIT 1
+"""
+
+_OWNED_VOUCHER_Q = f"""
+MATCH (u:User {{id:$uid}})-[{_OWNS_EDGES[0]}]->(b:BusinessProfile)
+MATCH (v:Voucher {{code:$code}})-[:FOR_OFFER]->(o:Offer)-[:OF]->(b)
+RETURN v.code AS code,
+       v.status AS status,
+       toInteger(v.expiresAt) AS expiresAt,
+       o.id AS offer_id,
+       o.title AS offer_title,
+       toInteger(o.eco_price) AS eco_price,
+       b.id AS business_id
+LIMIT 1
+"""
+
+_GET_OWNED_OFFER_Q = f"""
+MATCH (u:User {{id:$uid}})-[{_OWNS_EDGES[0]}]->(b:BusinessProfile)<-[:OF]-(o:Offer {{id:$oid}})
+RETURN o{{.*, business_id:b.id}} AS offer
+LIMIT 1
+"""
+
+_PATCH_OWNED_OFFER_Q = """
+MATCH (o:Offer {id:$oid})-[:OF]->(b:BusinessProfile {id:$bid})
+SET o += $fields, o.updated_at = $now
+RETURN o{.*, business_id:b.id} AS offer
+"""
+
+_DELETE_OWNED_OFFER_Q = f"""
+MATCH (u:User {{id:$uid}})-[{_OWNS_EDGES[0]}]->(:BusinessProfile)<-[:OF]-(o:Offer {{id:$oid}})
+WITH DISTINCT o
+DETACH DELETE o
+RETURN count(*) AS n
+"""
 
 
 def _resolve_user_business_id(
@@ -57,30 +95,22 @@ def _resolve_user_business_id(
     user_id: str,
     requested_business_id: Optional[str],
 ) -> str:
+    # One round trip covers both the explicit-id check and the "only business" case.
+    rec = s.run(_RESOLVE_BID_Q, uid=user_id, bid=requested_business_id or None).single()
+    resolved = rec["resolved"] if rec else None
+    if resolved:
+        return resolved
     if requested_business_id:
-        rec = s.run(
-            f"""
-            MATCH (u:User {{id:$uid}})-[{_OWNS_EDGES[0]}]->(b:BusinessProfile {{id:$bid}})
-            RETURN b.id AS id
-            LIMIT 1
-            """,
-            uid=user_id,
-            bid=requested_business_id,
-        ).single()
-        if not rec:
-            raise HTTPException(
-                status_code=403, detail="You don't have access to that business"
-            )
-        return requested_business_id
+        raise HTTPException(
+            status_code=403, detail="You don't have access to that business"
+        )
 
-    ids = _get_user_business_ids(s, user_id)
+    ids = sorted(rec["ids"] or []) if rec else []
     if len(ids) == 0:
         raise HTTPException(
             status_code=404,
             detail="You don't have a business yet or you arent a business!",
         )
-    if len(ids) == 1:
-        return ids[0]
     raise HTTPException(
         status_code=400,
         detail={
@@ -91,15 +121,7 @@ def _resolve_user_business_id(
 
 
 def _assert_offer_belongs_to_user(s: Session, user_id: str, offer_id: str) -> str:
-    rec = s.run(
-        f"""
-        MATCH (u:User {{id:$uid}})-[{_OWNS_EDGES[0]}]->(b:BusinessProfile)<-[:OF]-(o:Offer {{id:$oid}})
-        RETURN b.id AS bid
-        LIMIT 1
-        """,
-        uid=user_id,
-        oid=offer_id,
-    ).single()
+    rec = s.run(_OFFER_OWNER_Q, uid=user_id, oid=offer_id).single()
     if not rec:
         raise HTTPException(status_code=403, detail="Offer not found or not yours")
     return rec["bid"]
@@ -108,22 +130,7 @@ def _assert_offer_belongs_to_user(s: Session, user_id: str, offer_id: str) -> st
 def _assert_voucher_belongs_to_user_business(
     s: Session, user_id: str, voucher_code: str
 ) -> Dict[str, Any]:
-    rec = s.run(
-        f"""
-        MATCH (u:User {{id:$uid}})-[{_OWNS_EDGES[0]}]->(b:BusinessProfile)
-        MATCH (v:Voucher {{code:$code}})-[:FOR_OFFER]->(o:Offer)-[:OF]->(b)
-        RETURN v.code AS code,
-               v.status AS status,
-               toInteger(v.expiresAt) AS expiresAt,
-               o.id AS offer_id,
-               o.title AS offer_title,
-               toInteger(o.eco_price) AS eco_price,
-               b.id AS business_id
-        LIMIT 1
-        """,
-        uid=user_id,
-        code=voucher_code,
-    ).single()
+    rec = s.run(_OWNED_VOUCHER_Q, uid=user_id, code=voucher_code).single()
     if not rec:
         raise HTTPException(
             status_code=404, detail="Voucher not found or not for your business"
@@ -141,29 +148,11 @@ def _assert_voucher_belongs_to_user_business(
 
 def _user_wallet_balance(s: Session, user_id: str) -> int:
     """
-    Canonical youth ECO balance based solely on EcoTx.
+    Canonical youth ECO balance based solely on EcoTx: User.eco_balance
+    (kept in step by the ledger writers) or, if not yet backfilled, the sum.
     Vouchers are *not* part of the ledger; they're just UX tokens.
     """
-    row = s.run(
-        """
-        // Earned (posted)
-        CALL {
-          WITH $uid AS uid
-          OPTIONAL MATCH (:User {id: uid})-[:EARNED]->(te:EcoTx {status:'settled'})
-          WHERE te.kind IN ['MINT_ACTION']
-          RETURN coalesce(sum(toInteger(coalesce(te.amount, te.eco, 0))), 0) AS earned
-        }
-        // Spent (posted)
-        CALL {
-          WITH $uid AS uid
-          OPTIONAL MATCH (:User {id: uid})-[:SPENT]->(ts:EcoTx {status:'settled'})
-          WHERE ts.kind IN ['BURN_REWARD','CONTRIBUTE']
-          RETURN coalesce(sum(toInteger(coalesce(ts.amount, ts.eco, 0))), 0) AS spent
-        }
-        RETURN toInteger(earned - spent) AS balance
-        """,
-        uid=user_id,
-    ).single()
+    row = s.run(balance_cache.WALLET_BALANCE_Q, uid=user_id).single()
     return int(row["balance"]) if row and row["balance"] is not None else 0
 
 
@@ -309,13 +298,14 @@ def _is_visible(o: Dict[str, Any]) -> bool:
 
 
 @router.get("/offers", response_model=List[OfferOut])
-def list_offers_api(
-    s: Session = Depends(session_dep),
+async def list_offers_api(
+    s: AsyncSession = Depends(async_session_dep),
     business_id: Optional[str] = Query(None, alias="business_id"),
     status: Optional[str] = Query(None, pattern="^(active|paused|hidden)$"),
     visible_only: bool = Query(False),
+    tag: Optional[str] = Query(None, description="Only offers carrying this tag"),
 ):
-    raw = svc_list_offers(s, business_id=business_id, visible_only=visible_only)
+    raw = await svc_list_offers_async(s, business_id=business_id, visible_only=visible_only, tag=tag)
 
     offers = [
         _normalize_offer(dict(o) if not isinstance(o, dict) else o)
@@ -328,7 +318,9 @@ def list_offers_api(
     if visible_only:
         offers = [o for o in offers if _is_visible(o)]
 
-    return [OfferOut(**o) for o in offers]
+    # Rows are already normalised to the OfferOut shape; skip per-row
+    # re-validation (response_model stays for the schema).
+    return ORJSONResponse([dict(o, business_id=o["business_id"] or business_id) for o in offers])
 
 
 @router.get("/offers/{offer_id}", response_model=OfferOut)
@@ -337,17 +329,9 @@ def get_offer_api(
     s: Session = Depends(session_dep),
     user_id: str = Depends(current_user_id),
 ):
-    bid = _assert_offer_belongs_to_user(s, user_id, offer_id)
-    rec = s.run(
-        """
-        MATCH (o:Offer {id:$oid})-[:OF]->(b:BusinessProfile {id:$bid})
-        RETURN o{.*, business_id:b.id} AS offer
-        """,
-        oid=offer_id,
-        bid=bid,
-    ).single()
+    rec = s.run(_GET_OWNED_OFFER_Q, uid=user_id, oid=offer_id).single()
     if not rec:
-        raise HTTPException(status_code=404, detail="Offer not found")
+        raise HTTPException(status_code=403, detail="Offer not found or not yours")
     o = dict(rec["offer"])
     o.setdefault("claims", 0)
     return OfferOut(**o)
@@ -430,22 +414,10 @@ def patch_offer_api(
         o = svc_patch_offer(s, offer_id=offer_id, fields=fields)
         return OfferOut(**o, business_id=bid)
 
-    sets = []
-    params: Dict[str, Any] = {"oid": offer_id, "now": now_ms(), "bid": bid}
-    for k, v in fields.items():
-        if k == "valid_until" and v is not None:
-            v = str(v)
-        params[k] = v
-        sets.append(f"o.{k} = ${k}")
-    set_clause = ", ".join(sets + ["o.updated_at = $now"]) if sets else "o.updated_at = $now"
-
+    if fields.get("valid_until") is not None:
+        fields["valid_until"] = str(fields["valid_until"])
     rec = s.run(
-        f"""
-        MATCH (o:Offer {{id:$oid}})-[:OF]->(b:BusinessProfile {{id:$bid}})
-        SET {set_clause}
-        RETURN o{{.*, business_id:b.id}} AS offer
-        """,
-        **params,
+        _PATCH_OWNED_OFFER_Q, oid=offer_id, bid=bid, fields=fields, now=now_ms()
     ).single()
     if not rec:
         raise HTTPException(status_code=404, detail="Offer not found")
@@ -460,17 +432,9 @@ def delete_offer_api(
     s: Session = Depends(session_dep),
     user_id: str = Depends(current_user_id),
 ):
-    _assert_offer_belongs_to_user(s, user_id, offer_id)
-    if svc_delete_offer:
-        svc_delete_offer(s, offer_id=offer_id)
-    else:
-        s.run(
-            """
-            MATCH (o:Offer {id:$oid})
-            DETACH DELETE o
-            """,
-            oid=offer_id,
-        )
+    rec = s.run(_DELETE_OWNED_OFFER_Q, uid=user_id, oid=offer_id).single()
+    if not rec or not rec["n"]:
+        raise HTTPException(status_code=403, detail="Offer not found or not yours")
     return {"ok": True}
 
 
@@ -556,7 +520,7 @@ def redeem_offer_api(
         raise HTTPException(status_code=402, detail="Temporarily unavailable")
 
     # 4) Create Voucher (UX) + EcoTx (ledger) + business payout EcoTx
-    s.run(
+    wrote = s.run(
         """
         MATCH (o:Offer {id:$oid})-[:OF]->(b:BusinessProfile {id:$bid})
         MATCH (u:User {id:$uid})
@@ -598,6 +562,8 @@ def redeem_offer_api(
         )
 
         SET o.claims = coalesce(o.claims,0) + 1
+        // Denormalized wallet; stays unset (ledger fallback) until backfilled
+        SET u.eco_balance = u.eco_balance - $eco_price
 
         // Sponsor payout (fiat) - canonical business spend
         FOREACH (_ IN CASE WHEN $fiat_cost > 0 THEN [1] ELSE [] END |
@@ -617,6 +583,8 @@ def redeem_offer_api(
           MERGE (b)-[:SPENT]->(p)
           MERGE (p)-[:PAIRS]->(t)
         )
+
+        RETURN u.eco_balance AS balance_after
         """,
         oid=offer_id,
         bid=bid,
@@ -630,10 +598,15 @@ def redeem_offer_api(
         now=now,
         now_iso=now_iso_str,
         expires=expires_at,
-    )
+    ).single()
 
-    # Derive new balance purely from EcoTx so it matches wallet logic
-    balance_after = max(0, user_balance_before - eco_price)
+    # Post-write User.eco_balance from the same statement (sees concurrent
+    # spends); ledger-derived arithmetic for users not yet backfilled.
+    if wrote and wrote["balance_after"] is not None:
+        balance_after = max(0, int(wrote["balance_after"]))
+    else:
+        balance_after = max(0, user_balance_before - eco_price)
+    balance_cache.put(user_id, balance_after)
 
     return RedeemResponse(
         offer_id=offer_id,
@@ -820,15 +793,15 @@ def get_business_metrics_api(
     s: Session = Depends(session_dep),
     user_id: str = Depends(current_user_id),
 ):
-    bid = _resolve_user_business_id(s, user_id, business_id)
+    # An explicit business_id is ownership-checked by the metrics query itself.
+    bid = business_id or _resolve_user_business_id(s, user_id, None)
 
-    since_ms = int(
-        (datetime.now(tz=timezone.utc) - timedelta(days=30)).timestamp() * 1000
-    )
+    since_ms = now_ms() - 30 * 86_400_000
 
     rec = s.run(
         """
-        MATCH (b:BusinessProfile {id:$bid})
+        MATCH (:User {id:$uid})-[:OWNS|MANAGES]->(b:BusinessProfile {id:$bid})
+        WITH DISTINCT b
         OPTIONAL MATCH (b)<-[:OF]-(o:Offer)<-[:FOR_OFFER]-(t:EcoTx {kind:'BURN_REWARD', status:'settled'})
         WITH b, sum(coalesce(t.amount,0)) AS eco_retired_total
         OPTIONAL MATCH (b)<-[:OF]-(o2:Offer)<-[:FOR_OFFER]-(t2:EcoTx {kind:'BURN_REWARD', status:'settled'})
@@ -851,23 +824,25 @@ def get_business_metrics_api(
           toInteger(unique_claimants_30d) AS unique_claimants_30d,
           toInteger(coalesce(sum(m.amount),0)) AS minted_eco_30d
         """,
+        uid=user_id,
         bid=bid,
         since=since_ms,
     ).single()
 
     if not rec:
-        raise HTTPException(status_code=404, detail="Business not found")
-
-    return BusinessMetricsOut(
-        business_id=bid,
-        name=rec.get("name"),
-        sponsor_balance_cents=int(rec.get("sponsor_balance_cents") or 0),
-        eco_retired_total=int(rec.get("eco_retired_total") or 0),
-        eco_retired_30d=int(rec.get("eco_retired_30d") or 0),
-        redemptions_30d=int(rec.get("redemptions_30d") or 0),
-        unique_claimants_30d=int(rec.get("unique_claimants_30d") or 0),
-        minted_eco_30d=int(rec.get("minted_eco_30d") or 0),
-    )
+        raise HTTPException(status_code=403, detail="You don't have access to that business")
+
+    # Fields are already coerced to the BusinessMetricsOut shape; skip re-validation.
+    return ORJSONResponse({
+        "business_id": bid,
+        "name": rec.get("name"),
+        "sponsor_balance_cents": int(rec.get("sponsor_balance_cents") or 0),
+        "eco_retired_total": int(rec.get("eco_retired_total") or 0),
+        "eco_retired_30d": int(rec.get("eco_retired_30d") or 0),
+        "redemptions_30d": int(rec.get("redemptions_30d") or 0),
+        "unique_claimants_30d": int(rec.get("unique_claimants_30d") or 0),
+        "minted_eco_30d": int(rec.get("minted_eco_30d") or 0),
+    })
 
 
 class PlaceItemOut(BaseModel):
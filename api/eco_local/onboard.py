@@ -1,19 +1,23 @@
 # api/routers/eco-local_onboard.py
 from __future__ import annotations
-from typing import Optional, Dict, Any
+import threading
+import time
+from functools import lru_cache
+from typing import Optional, Dict, Any, FrozenSet, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from neo4j import Session
+from neo4j import AsyncManagedTransaction, AsyncSession, ManagedTransaction, Record, Session
 
-from site_backend.core.neo_driver import session_dep
+from site_backend.core.neo_driver import async_session_dep, session_dep
 from site_backend.core.user_guard import current_user_id
 from site_backend.api.eco_local.neo_business import (
-    business_init,
-    business_update_standards,
+    business_init_async,
+    business_update_standards_async,
 )
 
-router = APIRouter(prefix="/eco-local", tags=["onboarding"])
+router = APIRouter(prefix="/eco-local", tags=["onboarding"], default_response_class=ORJSONResponse)
 
 # ---------------- Models ----------------
 class InitIn(BaseModel):
@@ -52,47 +56,200 @@ class StatusOut(BaseModel):
     business_id: str
     completed: bool
 
+class MockCheckoutIn(BaseModel):
+    monthly_aud: Optional[int] = None
+
+# ---------------- Queries ----------------
+# Ownership is OWNS or MANAGES; every query is a static literal for the plan cache.
+_OWNED_IDS_Q = """
+MATCH (u:User {id:$uid})-[r]->(b:BusinessProfile)
+WHERE type(r) IN ['OWNS','MANAGES']
+WITH DISTINCT b.id AS id
+ORDER BY id
+RETURN collect(id) AS ids
+"""
+
+_STATUS_Q = """
+MATCH (u:User {id:$uid})-[r]->(b:BusinessProfile {id:$bid})
+WHERE type(r) IN ['OWNS','MANAGES']
+RETURN b.id AS bid, coalesce(b.onboarding_completed,false) AS ok
+LIMIT 1
+"""
+
+_COMPLETE_Q = """
+MATCH (u:User {id:$uid})-[r]->(b:BusinessProfile {id:$bid})
+WHERE type(r) IN ['OWNS','MANAGES']
+WITH DISTINCT b
+SET b.onboarding_completed = true, b.onboarding_completed_at = timestamp()
+RETURN b.id AS bid
+"""
+
+_CHECKOUT_Q = """
+MATCH (u:User {id:$uid})-[r]->(b:BusinessProfile {id:$bid})
+WHERE type(r) IN ['OWNS','MANAGES']
+WITH DISTINCT b
+SET b.latest_unit_amount_aud=$amt,
+    b.subscription_status='active'
+RETURN b.id AS bid
+"""
+
 # ---------------- Helpers ----------------
-def _resolve_user_business_id(s: Session, user_id: str, requested: Optional[str]) -> str:
+# user_id -> (expires, ids of every business it OWNS/MANAGES). One query answers
+# both "which is my business" and "may I touch ?business_id=X" for the TTL.
+# Empty sets are never cached (a brand-new owner is never served a stale 404),
+# and an id missing from a cached set is re-checked against Neo4j before a 403.
+_OWNED_TTL_S = 60.0
+_OWNED_MAX_USERS = 10_000
+_owned_lock = threading.Lock()
+_owned_by_user: Dict[str, Tuple[float, FrozenSet[str]]] = {}
+
+def forget_user_businesses(user_id: str) -> None:
+    with _owned_lock:
+        _owned_by_user.pop(user_id, None)
+
+def _cached_owned(user_id: str) -> Optional[FrozenSet[str]]:
+    hit = _owned_by_user.get(user_id)
+    if hit is None or hit[0] < time.monotonic():
+        return None
+    return hit[1]
+
+def _cache_owned(user_id: str, ids: FrozenSet[str]) -> None:
+    with _owned_lock:
+        if user_id not in _owned_by_user and len(_owned_by_user) >= _OWNED_MAX_USERS:
+            # Drop the oldest users (dicts keep insertion order).
+            for k in list(_owned_by_user)[: len(_owned_by_user) - _OWNED_MAX_USERS + 1]:
+                _owned_by_user.pop(k, None)
+        _owned_by_user[user_id] = (time.monotonic() + _OWNED_TTL_S, ids)
+
+# Managed transactions: reads may be routed to a follower/read replica in a
+# cluster and both kinds are retried on transient errors.
+async def _read_one(s: AsyncSession, cypher: str, params: Dict[str, Any]) -> Optional[Record]:
+    async def work(tx: AsyncManagedTransaction) -> Optional[Record]:
+        res = await tx.run(cypher, params)
+        return await res.single()
+    return await s.execute_read(work)
+
+async def _write_one(s: AsyncSession, cypher: str, params: Dict[str, Any]) -> Optional[Record]:
+    async def work(tx: AsyncManagedTransaction) -> Optional[Record]:
+        res = await tx.run(cypher, params)
+        return await res.single()
+    return await s.execute_write(work)
+
+async def _load_owned(s: AsyncSession, user_id: str) -> FrozenSet[str]:
+    # One record carrying a plain list, not one Record per business.
+    rec = await _read_one(s, _OWNED_IDS_Q, {"uid": user_id})
+    ids = frozenset(rec["ids"] if rec else ())
+    if ids:
+        _cache_owned(user_id, ids)
+    return ids
+
+def _load_owned_sync(s: Session, user_id: str) -> FrozenSet[str]:
+    def work(tx: ManagedTransaction) -> Optional[Record]:
+        return tx.run(_OWNED_IDS_Q, uid=user_id).single()
+    rec = s.execute_read(work)
+    ids = frozenset(rec["ids"] if rec else ())
+    if ids:
+        _cache_owned(user_id, ids)
+    return ids
+
+def _pick_business_id(owned: FrozenSet[str], requested: Optional[str]) -> str:
     if requested:
-        ok = s.run(
-            """
-            MATCH (u:User {id:$uid})-[r]->(b:BusinessProfile {id:$bid})
-            WHERE type(r) IN ['OWNS','MANAGES']
-            RETURN 1 AS ok
-            """,
-            uid=user_id, bid=requested,
-        ).single()
-        if not ok:
+        if requested not in owned:
             raise HTTPException(status_code=403, detail="You don't have access to that business")
         return requested
 
-    ids = [r["id"] for r in s.run(
-        """
-        MATCH (u:User {id:$uid})-[r]->(b:BusinessProfile)
-        WHERE type(r) IN ['OWNS','MANAGES']
-        RETURN b.id AS id
-        ORDER BY id
-        """,
-        uid=user_id,
-    )]
-    if not ids:
+    if not owned:
         raise HTTPException(status_code=404, detail="You don't have a business yet")
-    if len(ids) > 1:
+    if len(owned) > 1:
         raise HTTPException(
             status_code=400,
-            detail={"message": "Multiple businesses; specify ?business_id=...", "your_business_ids": ids},
+            detail={"message": "Multiple businesses; specify ?business_id=...", "your_business_ids": sorted(owned)},
         )
-    return ids[0]
+    return next(iter(owned))
+
+async def _resolve_user_business_id(s: AsyncSession, user_id: str, requested: Optional[str]) -> str:
+    owned = _cached_owned(user_id)
+    if owned is None or (requested and requested not in owned):
+        owned = await _load_owned(s, user_id)
+    return _pick_business_id(owned, requested)
+
+def _resolve_user_business_id_sync(s: Session, user_id: str, requested: Optional[str]) -> str:
+    owned = _cached_owned(user_id)
+    if owned is None or (requested and requested not in owned):
+        owned = _load_owned_sync(s, user_id)
+    return _pick_business_id(owned, requested)
+
+async def resolved_business_id(
+    request: Request,
+    business_id: Optional[str] = Query(None),
+    s: AsyncSession = Depends(async_session_dep),
+    user_id: str = Depends(current_user_id),
+) -> str:
+    """
+    Depends() form of _resolve_user_business_id; FastAPI caches it per request and
+    the answer is also left on request.state.business_id for non-Depends code.
+    """
+    bid = await _resolve_user_business_id(s, user_id, business_id)
+    request.state.business_id = bid
+    return bid
+
+def resolved_business_id_sync(
+    request: Request,
+    business_id: Optional[str] = Query(None),
+    s: Session = Depends(session_dep),
+    user_id: str = Depends(current_user_id),
+) -> str:
+    """
+    resolved_business_id for sync routers: resolves on the same (per-request
+    cached) session_dep session as the handler, so one request holds one session.
+    """
+    bid = _resolve_user_business_id_sync(s, user_id, business_id)
+    request.state.business_id = bid
+    return bid
+
+async def candidate_business_id(
+    request: Request,
+    business_id: Optional[str] = Query(None),
+    s: AsyncSession = Depends(async_session_dep),
+    user_id: str = Depends(current_user_id),
+) -> str:
+    """
+    Like resolved_business_id, but an explicit ?business_id= is passed through
+    unchecked: the status/complete/checkout queries carry the ownership MATCH
+    themselves, so it is authorised in the same round trip.
+    """
+    bid = getattr(request.state, "business_id", None)
+    if bid is None:
+        bid = business_id or await _resolve_user_business_id(s, user_id, None)
+    return bid
+
+def _not_owned(requested: Optional[str]) -> HTTPException:
+    if requested:
+        return HTTPException(status_code=403, detail="You don't have access to that business")
+    return HTTPException(status_code=404, detail="Business not found")
+
+# Pricing table for /business/recommend.
+_BASE_BY_SIZE = {"1-5": 25, "6-20": 49, "21-50": 150, "50+": 200}
+_AREA_MULT = {"cbd": 1.35, "suburb": 1.0, "regional": 0.85}
+_PLEDGE_MULT = {"starter": 1, "builder": 1.3, "leader": 1.5}
+
+@lru_cache(maxsize=1024)
+def _recommend(size: str, area: str, pledge: str) -> Tuple[int, int, float, float]:
+    """(monthly_aud, size_base, area_multiplier, pledge_multiplier)."""
+    base = _BASE_BY_SIZE.get(size, 49)
+    area_m = _AREA_MULT.get(area, 1.0)
+    pledge_m = _PLEDGE_MULT.get(pledge, 1.0)
+    amt = max(0, min(999, int(round(base * area_m * pledge_m))))
+    return amt, base, area_m, pledge_m
 
 # ---------------- Endpoints ----------------
 @router.post("/business/init", response_model=InitOut, status_code=201)
-def business_init_api(
+async def business_init_api(
     payload: InitIn,
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
     user_id: str = Depends(current_user_id),
 ):
-    out = business_init(
+    out = await business_init_async(
         s,
         user_id=user_id,
         business_name=payload.business_name.strip(),
@@ -102,26 +259,16 @@ def business_init_api(
         pledge_tier=payload.pledge.strip(),
     )
     bid = out["business_id"]
-
-    # Mark onboarding not completed yet (idempotent)
-    s.run(
-        """
-        MATCH (b:BusinessProfile {id:$bid})
-        SET b.onboarding_completed = coalesce(b.onboarding_completed,false)
-        """,
-        bid=bid,
-    )
-    return InitOut(business_id=bid, qr_code=out["qr_code"])
+    forget_user_businesses(user_id)
+    return InitOut.model_construct(business_id=bid, qr_code=out["qr_code"])
 
 @router.post("/business/profile", response_model=dict)
-def business_profile_api(
+async def business_profile_api(
     payload: ProfileIn,
-    s: Session = Depends(session_dep),
-    user_id: str = Depends(current_user_id),
-    business_id: Optional[str] = Query(None),
+    s: AsyncSession = Depends(async_session_dep),
+    bid: str = Depends(resolved_business_id),
 ):
-    bid = _resolve_user_business_id(s, user_id, business_id)
-    business_update_standards(
+    await business_update_standards_async(
         s,
         business_id=bid,
         standards_eco=payload.standards_eco,
@@ -133,94 +280,75 @@ def business_profile_api(
     return {"ok": True, "business_id": bid}
 
 @router.post("/business/recommend", response_model=RecommendOut)
-def business_recommend_api(payload: RecommendIn):
-    base_by_size = {"1-5": 25, "6-20": 49, "21-50": 150, "50+": 200}
-    area_mult = {"cbd": 1.35, "suburb": 1.0, "regional": 0.85}
-    pledge_mult = {"starter": 1, "builder": 1.3, "leader": 1.5}
-
-    base = base_by_size.get(payload.size, 49)
-    amt = int(round(base * area_mult.get(payload.area, 1.0) * pledge_mult.get(payload.pledge, 1.0)))
-    amt = max(0, min(999, amt))
-
+async def business_recommend_api(payload: RecommendIn):
+    amt, base, area_m, pledge_m = _recommend(payload.size, payload.area, payload.pledge)
     breakdown = {
         "size_base": base,
-        "area_multiplier": area_mult.get(payload.area, 1.0),
-        "pledge_multiplier": pledge_mult.get(payload.pledge, 1.0),
+        "area_multiplier": area_m,
+        "pledge_multiplier": pledge_m,
         "policy": "1 AUD = 1 ECO; scan rewards mint as needed.",
-        "inputs": payload.model_dump(),
+        "inputs": {
+            "business_name": payload.business_name,
+            "industry_group": payload.industry_group,
+            "size": payload.size,
+            "area": payload.area,
+            "pledge": payload.pledge,
+        },
     }
-    return RecommendOut(
-        recommended_monthly_aud=amt,
-        breakdown=breakdown,
-        pay_what_you_want=True,
-        min_aud=0,
-        max_aud=999,
-    )
+    # Server-built dict in the RecommendOut shape; response_model stays for the
+    # schema, returning the response directly skips re-validating it.
+    return ORJSONResponse({
+        "recommended_monthly_aud": amt,
+        "breakdown": breakdown,
+        "pay_what_you_want": True,
+        "min_aud": 0,
+        "max_aud": 999,
+    })
 
 @router.get("/business/onboarding_status", response_model=StatusOut)
-def onboarding_status_api(
-    s: Session = Depends(session_dep),
-    user_id: str = Depends(current_user_id),
+async def onboarding_status_api(
     business_id: Optional[str] = Query(None),
+    s: AsyncSession = Depends(async_session_dep),
+    user_id: str = Depends(current_user_id),
+    bid: str = Depends(candidate_business_id),
 ):
-    bid = _resolve_user_business_id(s, user_id, business_id)
-    rec = s.run(
-        """
-        MATCH (b:BusinessProfile {id:$bid})
-        RETURN b.id AS bid, coalesce(b.onboarding_completed,false) AS ok
-        """,
-        bid=bid,
-    ).single()
+    rec = await _read_one(s, _STATUS_Q, {"uid": user_id, "bid": bid})
     if not rec:
-        raise HTTPException(status_code=404, detail="Business not found")
-    return StatusOut(business_id=rec["bid"], completed=bool(rec["ok"]))
+        raise _not_owned(business_id)
+    return ORJSONResponse({"business_id": rec["bid"], "completed": bool(rec["ok"])})
 
 @router.post("/business/onboarding_complete", response_model=dict)
-def onboarding_complete_api(
-    s: Session = Depends(session_dep),
-    user_id: str = Depends(current_user_id),
+async def onboarding_complete_api(
     business_id: Optional[str] = Query(None),
+    s: AsyncSession = Depends(async_session_dep),
+    user_id: str = Depends(current_user_id),
+    bid: str = Depends(candidate_business_id),
 ):
-    bid = _resolve_user_business_id(s, user_id, business_id)
-    s.run(
-        """
-        MATCH (b:BusinessProfile {id:$bid})
-        SET b.onboarding_completed = true, b.onboarding_completed_at = timestamp()
-        """,
-        bid=bid,
-    )
+    rec = await _write_one(s, _COMPLETE_Q, {"uid": user_id, "bid": bid})
+    if not rec:
+        raise _not_owned(business_id)
     return {"ok": True, "business_id": bid}
 
 # ---- Dev helper: mock checkout ----
 @router.post("/dev/mock_checkout", response_model=dict)
-def dev_mock_checkout_api(
-    payload: Optional[dict] = Body(default=None),
+async def dev_mock_checkout_api(
+    payload: Optional[MockCheckoutIn] = Body(default=None),
     monthly_aud: Optional[int] = Query(default=None),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
     user_id: str = Depends(current_user_id),
     business_id: Optional[str] = Query(None),
+    bid: str = Depends(candidate_business_id),
 ):
-    amt = None
-    if payload and "monthly_aud" in payload:
-        try:
-            amt = int(payload["monthly_aud"])
-        except Exception:
-            pass
-    if amt is None and monthly_aud is not None:
-        amt = int(monthly_aud)
+    amt = payload.monthly_aud if payload else None
+    if amt is None:
+        amt = monthly_aud
     if amt is None:
         raise HTTPException(status_code=400, detail="monthly_aud is required")
 
-    bid = _resolve_user_business_id(s, user_id, business_id)
     if amt < 5:
         raise HTTPException(status_code=400, detail="Min $5")
 
-    s.run(
-        """
-        MATCH (b:BusinessProfile {id:$bid})
-        SET b.latest_unit_amount_aud=$amt,
-            b.subscription_status='active'
-        """,
-        bid=bid, amt=int(amt),
-    )
-    return {"ok": True, "business_id": bid, "monthly_aud": int(amt)}
+    rec = await _write_one(s, _CHECKOUT_Q, {"uid": user_id, "bid": bid, "amt": amt})
+    if not rec:
+        raise _not_owned(business_id)
+    return {"ok": True, "business_id": bid, "monthly_aud": amt}
@@ -1,19 +1,23 @@
 # site_backend/api/eco-local/owner.py
 from __future__ import annotations
 
-from typing import List, Optional, Literal, Any, Dict
+import asyncio
+from typing import List, Optional, Literal, Any, Dict, Tuple
 from uuid import uuid4
 from datetime import datetime, timezone, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+import anyio
 import os
-import shutil
-import json  # still here in case you reintroduce templates/criteria later
+import threading
 
-from site_backend.core.neo_driver import session_dep   # yields a neo4j.Session
+from site_backend.core.neo_driver import SESSION_OPTS, async_driver_dep, async_session_dep
 from site_backend.core.user_guard import current_user_id  # validates Bearer or legacy cookie
-from neo4j import Session
+from site_backend.api.eco_local.claims import invalidate_qr_meta
+from site_backend.api.eco_local.neo_business import OFFER_TAGS_SYNC
+from neo4j import AsyncDriver, AsyncSession
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Offer models – aligned with new offers setup (eco_price, fiat, stock, status)
@@ -117,93 +121,180 @@ class PatchProfile(BaseModel):
     rules_geofence_radius_m: Optional[int] = None
 
 
-router = APIRouter(prefix="/eco-local/owner", tags=["eco_local.owner"])
-assets_router = APIRouter(prefix="/eco-local/assets", tags=["eco_local.assets"])
+router = APIRouter(prefix="/eco-local/owner", tags=["eco_local.owner"], default_response_class=ORJSONResponse)
+assets_router = APIRouter(prefix="/eco-local/assets", tags=["eco_local.assets"], default_response_class=ORJSONResponse)
 
 # Where to drop hero files (served by your StaticFiles mount)
 UPLOAD_DIR = os.getenv("ECO_LOCAL_UPLOAD_DIR", "uploads/hero")
+_UPLOAD_CHUNK = 1024 * 1024  # 1 MiB per read/write while copying uploads to disk
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Small helpers for Neo4j session access
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _one(s: Session, cypher: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    rec = s.run(cypher, **params).single()
+async def _one(s: AsyncSession, cypher: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    res = await s.run(cypher, params)
+    rec = await res.single()
     return rec.data() if rec else None
 
 
-def _all(s: Session, cypher: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
-    return [r.data() for r in s.run(cypher, **params)]
+async def _values(
+    s: AsyncSession, cypher: str, params: Dict[str, Any], keys: Tuple[str, ...]
+) -> List[Tuple[Any, ...]]:
+    """Rows as plain tuples in `keys` order (no per-record .data() dict)."""
+    res = await s.run(cypher, params)
+    return [tuple(r[k] for k in keys) async for r in res]
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Graph helpers - aligned to your constraints
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _ensure_owner_business(s: Session, user_id: str) -> str:
+# Ensure a BusinessProfile (and OWNS edge) exists for $uid and leave it bound as
+# `b`. _owner_q prepends this to an endpoint's own query instead of spending a
+# separate round trip on the MERGE.
+_ENSURE_OWNER_B = """
+MERGE (b:BusinessProfile {user_id: $uid})
+  ON CREATE SET
+    b.id = coalesce(b.id, randomUUID()),
+    b.visible_on_map = true,
+    b.created_at = datetime()
+WITH b
+MERGE (u:User {id: $uid})
+MERGE (u)-[:OWNS]->(b)
+WITH b
+"""
+
+
+# Same binding without the MERGE, for owners already known to be provisioned
+# (and for the dashboard, which ensures once, then fans out).
+_MATCH_OWNER_B = """
+MATCH (b:BusinessProfile {user_id: $uid})
+WITH b
+"""
+
+
+# Owners this worker has already provisioned (a dict used as an insertion-ordered
+# set). Creating the BusinessProfile is a one-time event, so for these users the
+# owner queries take the MATCH prefix instead of the MERGE; no TTL, only a size
+# cap (oldest users are dropped first).
+_PROVISIONED_MAX_USERS = 10_000
+_provisioned_lock = threading.Lock()
+_provisioned: Dict[str, None] = {}
+
+
+def _forget_provisioned(user_id: str) -> None:
+    with _provisioned_lock:
+        _provisioned.pop(user_id, None)
+
+
+def _mark_provisioned(user_id: str) -> None:
+    with _provisioned_lock:
+        if user_id not in _provisioned and len(_provisioned) >= _PROVISIONED_MAX_USERS:
+            for k in list(_provisioned)[: len(_provisioned) - _PROVISIONED_MAX_USERS + 1]:
+                _provisioned.pop(k, None)
+        _provisioned[user_id] = None
+
+
+def _owner_q(body: str, user_id: str, ensure: bool = True) -> str:
+    if ensure and user_id not in _provisioned:
+        return _ENSURE_OWNER_B + body
+    return _MATCH_OWNER_B + body
+
+
+async def _owner_one(
+    s: AsyncSession, body: str, params: Dict[str, Any], *, ensure: bool = True
+) -> Optional[Dict[str, Any]]:
     """
-    Ensure a BusinessProfile exists for this user_id; return business_id.
+    _one() for an owner query body (params carry $uid). A provisioned owner gets
+    the MATCH prefix. No row there can also mean the body filtered everything out
+    (e.g. an unknown offer id), so the MERGE re-run only happens once a separate
+    check shows the business itself is gone.
     """
-    cy = """
-    MERGE (b:BusinessProfile {user_id: $uid})
-      ON CREATE SET
-        b.id = coalesce(b.id, randomUUID()),
-        b.visible_on_map = true,
-        b.created_at = datetime()
-    WITH b
-    MERGE (u:User {id: $uid})
-    MERGE (u)-[:OWNS]->(b)
-    RETURN b.id AS id
+    uid = params["uid"]
+    if ensure and uid in _provisioned:
+        rec = await _one(s, _MATCH_OWNER_B + body, params)
+        if rec is not None:
+            return rec
+        if await _one(s, _MATCH_OWNER_B + "RETURN b.id AS id", {"uid": uid}) is not None:
+            return None
+        _forget_provisioned(uid)
+    rec = await _one(s, _owner_q(body, uid, ensure), params)
+    if ensure:
+        _mark_provisioned(uid)
+    return rec
+
+
+async def _owner_values(
+    s: AsyncSession, body: str, params: Dict[str, Any], keys: Tuple[str, ...], *, ensure: bool = True
+) -> List[Tuple[Any, ...]]:
     """
-    rec = _one(s, cy, {"uid": user_id})
-    return rec["id"]
-
-
-def _get_business(s: Session, user_id: str) -> Optional[BusinessMine]:
-    cy = """
-    MATCH (b:BusinessProfile {user_id: $uid})
-    OPTIONAL MATCH (q:QR)-[:OF]->(b)
-    RETURN b {
-      .id, .name, .tagline, .website, .address, .hours, .description,
-      .hero_url, .lat, .lng, .visible_on_map, .tags,
-      .pledge_tier, .rules_first_visit, .rules_return_visit, .rules_cooldown_hours,
-      .rules_daily_cap_per_user, .rules_geofence_radius_m
-    } AS b, q.code AS qr
+    _values() for an owner query body. No retry on an empty MATCH: a freshly
+    MERGEd business has no rows either, and the next single-row owner query
+    re-provisions it.
     """
-    rec = _one(s, cy, {"uid": user_id})
+    uid = params["uid"]
+    rows = await _values(s, _owner_q(body, uid, ensure), params, keys)
+    if ensure:
+        _mark_provisioned(uid)
+    return rows
+
+
+async def _ensure_owner_business(s: AsyncSession, user_id: str) -> None:
+    """
+    Ensure a BusinessProfile exists for this user_id; a no-op for owners this
+    worker has already provisioned.
+    """
+    if user_id in _provisioned:
+        return
+    await _one(s, _ENSURE_OWNER_B + "RETURN b.id AS id", {"uid": user_id})
+    _mark_provisioned(user_id)
+
+
+# Plain scalar fields copied 1:1 from the projected `b` map; visible_on_map,
+# tags and qr_code have defaults/extra sources and are set separately.
+_BUSINESS_FIELDS = (
+    "id", "name", "tagline", "website", "address", "hours", "description",
+    "hero_url", "lat", "lng",
+    "pledge_tier", "rules_first_visit", "rules_return_visit", "rules_cooldown_hours",
+    "rules_daily_cap_per_user", "rules_geofence_radius_m",
+)
+
+
+def _row_to_business(b: Dict[str, Any], qr: Optional[str]) -> BusinessMine:
+    return BusinessMine.model_construct(
+        qr_code=qr,
+        tags=b.get("tags") or [],
+        visible_on_map=b.get("visible_on_map", True),
+        **{k: b.get(k) for k in _BUSINESS_FIELDS},
+    )
+
+
+_GET_BUSINESS_Q = """
+MATCH (b:BusinessProfile {user_id: $uid})
+OPTIONAL MATCH (q:QR)-[:OF]->(b)
+RETURN b {
+  .id, .name, .tagline, .website, .address, .hours, .description,
+  .hero_url, .lat, .lng, .visible_on_map, .tags,
+  .pledge_tier, .rules_first_visit, .rules_return_visit, .rules_cooldown_hours,
+  .rules_daily_cap_per_user, .rules_geofence_radius_m
+} AS b, q.code AS qr
+"""
+
+
+async def _get_business(s: AsyncSession, user_id: str) -> Optional[BusinessMine]:
+    rec = await _one(s, _GET_BUSINESS_Q, {"uid": user_id})
     if not rec:
         return None
     b = rec.get("b") or {}
-    return BusinessMine(
-        id=b.get("id"),
-        name=b.get("name"),
-        tagline=b.get("tagline"),
-        website=b.get("website"),
-        address=b.get("address"),
-        hours=b.get("hours"),
-        description=b.get("description"),
-        hero_url=b.get("hero_url"),
-        lat=b.get("lat"),
-        lng=b.get("lng"),
-        visible_on_map=b.get("visible_on_map", True),
-        tags=b.get("tags") or [],
-        qr_code=rec.get("qr"),
-        pledge_tier=b.get("pledge_tier"),
-        rules_first_visit=b.get("rules_first_visit"),
-        rules_return_visit=b.get("rules_return_visit"),
-        rules_cooldown_hours=b.get("rules_cooldown_hours"),
-        rules_daily_cap_per_user=b.get("rules_daily_cap_per_user"),
-        rules_geofence_radius_m=b.get("rules_geofence_radius_m"),
-    )
+    return _row_to_business(b, rec.get("qr"))
 
 
-def _offer_record_to_out(rec: Dict[str, Any]) -> OfferOut:
+def _offer_dict(o: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Normalise graph Offer → API shape.
+    Normalise graph Offer → API shape (plain dict in the OfferOut layout).
     - Map legacy `visible` → `status` when `status` missing.
     - Map legacy `redeem_eco` → `eco_price` when needed.
     """
-    o = rec["o"]
-
     status = o.get("status")
     visible = o.get("visible")
     if not status:
@@ -216,189 +307,241 @@ def _offer_record_to_out(rec: Dict[str, Any]) -> OfferOut:
 
     fiat_cost = o.get("fiat_cost_cents") or 0
 
-    return OfferOut(
-        id=o.get("id"),
-        title=o.get("title") or "",
-        blurb=o.get("blurb"),
-        status=status,  # type: ignore[arg-type]
-        eco_price=int(eco_price or 0),
-        fiat_cost_cents=int(fiat_cost),
-        stock=o.get("stock"),
-        url=o.get("url"),
-        valid_until=o.get("valid_until"),
-        tags=o.get("tags") or [],
-    )
+    return {
+        "id": o.get("id"),
+        "title": o.get("title") or "",
+        "blurb": o.get("blurb"),
+        "status": status,
+        "eco_price": int(eco_price or 0),
+        "fiat_cost_cents": int(fiat_cost),
+        "stock": o.get("stock"),
+        "url": o.get("url"),
+        "valid_until": o.get("valid_until"),
+        "tags": o.get("tags") or [],
+    }
+
+
+def _offer_record_to_out(rec: Dict[str, Any]) -> OfferOut:
+    return OfferOut.model_construct(**_offer_dict(rec["o"]))
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Endpoints
 # ─────────────────────────────────────────────────────────────────────────────
 
+_MINE_Q = """
+MATCH (b:BusinessProfile {user_id: $uid})
+OPTIONAL MATCH (q:QR)-[:OF]->(b)
+RETURN {
+  id: b.id,
+  name: b.name,
+  tagline: coalesce(b.tagline, ''),
+  website: coalesce(b.website, ''),
+  address: coalesce(b.address, ''),
+  hours: coalesce(b.hours, {}),
+  description: coalesce(b.description, ''),
+  hero_url: coalesce(b.hero_url, ''),
+  lat: coalesce(b.lat, 0.0),
+  lng: coalesce(b.lng, 0.0),
+  visible_on_map: coalesce(b.visible_on_map, true),
+  tags: coalesce(b.tags, []),
+  pledge_tier: coalesce(b.pledge_tier, 'starter'),
+  rules_first_visit: coalesce(b.rules_first_visit, ''),
+  rules_return_visit: coalesce(b.rules_return_visit, ''),
+  rules_cooldown_hours: toInteger(coalesce(b.rules_cooldown_hours, 0)),
+  rules_daily_cap_per_user: toInteger(coalesce(b.rules_daily_cap_per_user, 0)),
+  rules_geofence_radius_m: toInteger(coalesce(b.rules_geofence_radius_m, 0)),
+  qr: q.code
+} AS result
+"""
+
+
+async def _mine_payload(s: AsyncSession, uid: str) -> Optional[Dict[str, Any]]:
+    rec = await _one(s, _MINE_Q, {"uid": uid})
+    return rec["result"] if rec else None
+
+
 @router.get("/mine")
-def owner_mine(
+async def owner_mine(
     uid: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
-    cy = """
-    MATCH (b:BusinessProfile {user_id: $uid})
-    OPTIONAL MATCH (q:QR)-[:OF]->(b)
-    RETURN {
-      id: b.id,
-      name: b.name,
-      tagline: coalesce(b.tagline, ''),
-      website: coalesce(b.website, ''),
-      address: coalesce(b.address, ''),
-      hours: coalesce(b.hours, {}),
-      description: coalesce(b.description, ''),
-      hero_url: coalesce(b.hero_url, ''),
-      lat: coalesce(b.lat, 0.0),
-      lng: coalesce(b.lng, 0.0),
-      visible_on_map: coalesce(b.visible_on_map, true),
-      tags: coalesce(b.tags, []),
-      pledge_tier: coalesce(b.pledge_tier, 'starter'),
-      rules_first_visit: coalesce(b.rules_first_visit, ''),
-      rules_return_visit: coalesce(b.rules_return_visit, ''),
-      rules_cooldown_hours: toInteger(coalesce(b.rules_cooldown_hours, 0)),
-      rules_daily_cap_per_user: toInteger(coalesce(b.rules_daily_cap_per_user, 0)),
-      rules_geofence_radius_m: toInteger(coalesce(b.rules_geofence_radius_m, 0)),
-      qr: q.code
-    } AS result
-    """
-    rec = s.run(cy, uid=uid).single()
-    if not rec:
+    result = await _mine_payload(s, uid)
+    if result is None:
         return {"result": None}
-    return rec["result"]
+    return result
+
+
+_METRICS_Q = """
+// -------- scans triggered at this business (QR check-ins) --------
+CALL {
+  WITH b
+  MATCH (b)-[:TRIGGERED]->(tscan:EcoTx {status:'settled'})
+  WHERE coalesce(tscan.kind,'')='scan'
+  WITH tscan,
+       toInteger(coalesce(tscan.createdAt, timestamp(tscan.at), timestamp())) AS ms,
+       toInteger(coalesce(tscan.eco, tscan.amount, 0)) AS eco
+  RETURN sum(eco)                                                    AS eco_triggered_total,
+         sum(CASE WHEN ms >= $cutoff_ms THEN eco ELSE 0 END)         AS eco_triggered_30d,
+         count(CASE WHEN ms >= $cutoff_ms THEN 1 END)                AS claims_30d,
+         count(DISTINCT CASE WHEN ms >= $cutoff_ms THEN tscan.user_id END) AS unique_claimants_30d,
+         max(CASE WHEN ms >= $cutoff_ms THEN ms END)                 AS last_ms
+}
+
+// -------- inbound contributions to the business --------
+CALL {
+  WITH b
+  MATCH (b)-[:COLLECTED|EARNED]->(tin:EcoTx {status:'settled'})
+  WHERE coalesce(tin.kind,'') IN ['CONTRIBUTE','SPONSOR_DEPOSIT']
+     OR coalesce(tin.source,'')='contribution'
+  WITH toInteger(coalesce(tin.createdAt, timestamp(tin.at), timestamp())) AS ms,
+       toInteger(coalesce(tin.eco, tin.amount, 0)) AS eco
+  RETURN sum(eco)                                            AS contributions_total,
+         sum(CASE WHEN ms >= $cutoff_ms THEN eco ELSE 0 END) AS contributions_30d
+}
+
+// -------- retirements via offer redemptions --------
+CALL {
+  WITH b
+  MATCH (b)-[:SPENT]->(tout:EcoTx {status:'settled'})
+  WHERE coalesce(tout.kind,'')='BURN_REWARD'
+  WITH toInteger(coalesce(tout.createdAt, timestamp(tout.at), timestamp())) AS ms,
+       toInteger(coalesce(tout.eco, tout.amount, 0)) AS eco
+  RETURN sum(eco)                                            AS eco_retired_total,
+         sum(CASE WHEN ms >= $cutoff_ms THEN eco ELSE 0 END) AS eco_retired_30d,
+         count(CASE WHEN ms >= $cutoff_ms THEN 1 END)        AS redemptions_30d
+}
+
+RETURN {
+  business_id: b.id,
+  sponsor_balance_cents: toInteger(coalesce(b.sponsor_balance_cents,0)),
+
+  // scans
+  eco_triggered_total: toInteger(coalesce(eco_triggered_total,0)),
+  eco_triggered_30d:   toInteger(coalesce(eco_triggered_30d,0)),
+  claims_30d:          toInteger(coalesce(claims_30d,0)),
+  unique_claimants_30d:toInteger(coalesce(unique_claimants_30d,0)),
+  last_claim_at:       (CASE WHEN last_ms IS NULL THEN NULL ELSE toString(datetime({epochMillis:last_ms})) END),
+
+  // inbound contributions
+  contributions_total: toInteger(coalesce(contributions_total,0)),
+  contributions_30d:   toInteger(coalesce(contributions_30d,0)),
+
+  // retirements (offers)
+  eco_retired_total:   toInteger(coalesce(eco_retired_total,0)),
+  eco_retired_30d:     toInteger(coalesce(eco_retired_30d,0)),
+  redemptions_30d:     toInteger(coalesce(redemptions_30d,0))
+} AS m
+"""
+
+
+async def _metrics_payload(s: AsyncSession, user_id: str, *, ensure: bool = True) -> Dict[str, Any]:
+    # Each CALL aggregates its tx stream with sum()/count()/max() instead of
+    # collect()-ing it into a list first; an empty stream still yields one row.
+
+    cutoff_ms = int((datetime.now(timezone.utc) - timedelta(days=30)).timestamp() * 1000)
+    params = {"uid": user_id, "cutoff_ms": cutoff_ms}
+    rec = await _owner_one(s, _METRICS_Q, params, ensure=ensure) or {"m": {}}
+    m = rec["m"] or {}
+
+    eco_velocity_30d = (m.get("eco_triggered_30d") or 0) / 30.0
+
+    return {
+        "business_id": m.get("business_id"),
+        "sponsor_balance_cents": int(m.get("sponsor_balance_cents") or 0),
+
+        # Triggered (scans)
+        "eco_triggered_total": int(m.get("eco_triggered_total") or 0),
+        "eco_triggered_30d": int(m.get("eco_triggered_30d") or 0),
+        "claims_30d": int(m.get("claims_30d") or 0),
+        "unique_claimants_30d": int(m.get("unique_claimants_30d") or 0),
+        "last_claim_at": m.get("last_claim_at"),
+
+        # Contributions in
+        "contributions_total": int(m.get("contributions_total") or 0),
+        "contributions_30d": int(m.get("contributions_30d") or 0),
+
+        # Retirements (offers)
+        "eco_retired_total": int(m.get("eco_retired_total") or 0),
+        "eco_retired_30d": int(m.get("eco_retired_30d") or 0),
+        "redemptions_30d": int(m.get("redemptions_30d") or 0),
+
+        # Derived rate
+        "eco_velocity_30d": round(float(eco_velocity_30d), 2),
+    }
 
 
 @router.get("/metrics", response_model=Dict[str, Any])
-def get_metrics(
+async def get_metrics(
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
-    _ensure_owner_business(s, user_id)
-
-    cy = """
-    MATCH (b:BusinessProfile {user_id:$uid})
-    WITH b, toInteger(timestamp(datetime() - duration({days:30}))) AS cutoff_ms
-
-    // -------- scans triggered at this business (QR check-ins) --------
-    OPTIONAL MATCH (b)-[:TRIGGERED]->(tscan:EcoTx {status:'settled'})
-    WHERE coalesce(tscan.kind,'')='scan'
-    WITH b, cutoff_ms,
-         collect({
-           ms:  toInteger(coalesce(tscan.createdAt, timestamp(tscan.at), timestamp())),
-           eco: toInteger(coalesce(tscan.eco, tscan.amount, 0)),
-           uid: tscan.user_id
-         }) AS scans
-
-    WITH b, cutoff_ms,
-         reduce(s=0, r IN scans | s + r.eco) AS eco_triggered_total,
-         [r IN scans WHERE r.ms >= cutoff_ms] AS scans30
-    WITH b, cutoff_ms, eco_triggered_total, scans30,
-         size(scans30) AS claims_30d,
-         reduce(s=0, r IN scans30 | s + r.eco) AS eco_triggered_30d,
-         // make a scalar max(ms) without APOC:
-         reduce(mx = -1, r IN scans30 | CASE WHEN r.ms > mx THEN r.ms ELSE mx END) AS last_ms_raw,
-         reduce(acc=[], r IN scans30 |
-            CASE WHEN r.uid IS NULL OR r.uid IN acc THEN acc ELSE acc + r.uid END
-         ) AS uniqs
-    WITH b, cutoff_ms, eco_triggered_total, claims_30d, eco_triggered_30d, last_ms_raw,
-         size(uniqs) AS unique_claimants_30d
-    WITH b, cutoff_ms, eco_triggered_total, claims_30d, eco_triggered_30d,
-         unique_claimants_30d,
-         CASE WHEN last_ms_raw < 0 THEN NULL ELSE last_ms_raw END AS last_ms
-
-    // -------- inbound contributions to the business --------
-    OPTIONAL MATCH (b)-[:COLLECTED|EARNED]->(tin:EcoTx {status:'settled'})
-    WHERE coalesce(tin.kind,'') IN ['CONTRIBUTE','SPONSOR_DEPOSIT']
-       OR coalesce(tin.source,'')='contribution'
-    WITH b, cutoff_ms, eco_triggered_total, claims_30d, eco_triggered_30d, unique_claimants_30d, last_ms,
-         collect({
-           ms:  toInteger(coalesce(tin.createdAt, timestamp(tin.at), timestamp())),
-           eco: toInteger(coalesce(tin.eco, tin.amount, 0))
-         }) AS ins
-
-    WITH b, cutoff_ms, eco_triggered_total, claims_30d, eco_triggered_30d, unique_claimants_30d, last_ms,
-         reduce(s=0, r IN ins | s + r.eco) AS contributions_total,
-         [r IN ins WHERE r.ms >= cutoff_ms] AS ins30
-    WITH b, cutoff_ms, eco_triggered_total, claims_30d, eco_triggered_30d, unique_claimants_30d, last_ms,
-         contributions_total,
-         reduce(s=0, r IN ins30 | s + r.eco) AS contributions_30d
-
-    // -------- retirements via offer redemptions --------
-    OPTIONAL MATCH (b)-[:SPENT]->(tout:EcoTx {status:'settled'})
-    WHERE coalesce(tout.kind,'')='BURN_REWARD'
-    WITH b, cutoff_ms, eco_triggered_total, claims_30d, eco_triggered_30d, unique_claimants_30d, last_ms,
-         contributions_total, contributions_30d,
-         collect({
-           ms:  toInteger(coalesce(tout.createdAt, timestamp(tout.at), timestamp())),
-           eco: toInteger(coalesce(tout.eco, tout.amount, 0))
-         }) AS outs
-
-    WITH b, cutoff_ms, eco_triggered_total, claims_30d, eco_triggered_30d, unique_claimants_30d, last_ms,
-         contributions_total, contributions_30d,
-         reduce(s=0, r IN outs | s + r.eco) AS eco_retired_total,
-         [r IN outs WHERE r.ms >= cutoff_ms] AS outs30
-
-    RETURN {
-      business_id: b.id,
-      sponsor_balance_cents: toInteger(coalesce(b.sponsor_balance_cents,0)),
-
-      // scans
-      eco_triggered_total: toInteger(coalesce(eco_triggered_total,0)),
-      eco_triggered_30d:   toInteger(coalesce(eco_triggered_30d,0)),
-      claims_30d:          toInteger(coalesce(claims_30d,0)),
-      unique_claimants_30d:toInteger(coalesce(unique_claimants_30d,0)),
-      last_claim_at:       (CASE WHEN last_ms IS NULL THEN NULL ELSE toString(datetime({epochMillis:last_ms})) END),
-
-      // inbound contributions
-      contributions_total: toInteger(coalesce(contributions_total,0)),
-      contributions_30d:   toInteger(coalesce(contributions_30d,0)),
-
-      // retirements (offers)
-      eco_retired_total:   toInteger(coalesce(eco_retired_total,0)),
-      eco_retired_30d:     toInteger(coalesce(reduce(s=0, r IN outs30 | s + r.eco),0)),
-      redemptions_30d:     toInteger(size(outs30))
-    } AS m
-    """
-
     try:
-        rec = _one(s, cy, {"uid": user_id}) or {"m": {}}
-        m = rec["m"] or {}
-
-        eco_velocity_30d = (m.get("eco_triggered_30d") or 0) / 30.0
-
-        return {
-            "business_id": m.get("business_id"),
-            "sponsor_balance_cents": int(m.get("sponsor_balance_cents") or 0),
-
-            # Triggered (scans)
-            "eco_triggered_total": int(m.get("eco_triggered_total") or 0),
-            "eco_triggered_30d": int(m.get("eco_triggered_30d") or 0),
-            "claims_30d": int(m.get("claims_30d") or 0),
-            "unique_claimants_30d": int(m.get("unique_claimants_30d") or 0),
-            "last_claim_at": m.get("last_claim_at"),
-
-            # Contributions in
-            "contributions_total": int(m.get("contributions_total") or 0),
-            "contributions_30d": int(m.get("contributions_30d") or 0),
-
-            # Retirements (offers)
-            "eco_retired_total": int(m.get("eco_retired_total") or 0),
-            "eco_retired_30d": int(m.get("eco_retired_30d") or 0),
-            "redemptions_30d": int(m.get("redemptions_30d") or 0),
-
-            # Derived rate
-            "eco_velocity_30d": round(float(eco_velocity_30d), 2),
-        }
+        return await _metrics_payload(s, user_id)
     except Exception as e:
-        from fastapi import HTTPException
         raise HTTPException(status_code=500, detail=f"/owner/metrics failed: {e}")
 
 
+# Keyset page over (valid_until DESC, title, id); $cursor is the id of the last
+# offer on the previous page and its sort key is looked up here, so the client
+# only ever round-trips an offer id.
+_OFFERS_Q = """
+// the cursor must be one of this business's offers; an unknown cursor
+// yields an empty page rather than restarting from the top
+OPTIONAL MATCH (c:Offer {id: $cursor})
+WHERE (b)-[:HAS_OFFER]->(c) OR (c)-[:OF]->(b)
+WITH b, coalesce(c.valid_until, '') AS c_vu, coalesce(c.title, '') AS c_title, c.id AS c_id
+WHERE $cursor IS NULL OR c_id IS NOT NULL
+CALL {
+  WITH b
+  MATCH (b)-[:HAS_OFFER]->(o:Offer)
+  RETURN o
+  UNION
+  WITH b
+  MATCH (o:Offer)-[:OF]->(b)
+  RETURN o
+}
+WITH o, coalesce(o.valid_until, '') AS vu, coalesce(o.title, '') AS title, c_vu, c_title, c_id
+WHERE $cursor IS NULL
+   OR vu < c_vu
+   OR (vu = c_vu AND (title > c_title OR (title = c_title AND o.id > c_id)))
+ORDER BY vu DESC, title, o.id
+LIMIT $limit
+RETURN o {
+  .id,
+  .title,
+  .blurb,
+  .status,
+  .eco_price,
+  .fiat_cost_cents,
+  .stock,
+  .url,
+  .valid_until,
+  .tags,
+  .visible,        // for legacy mapping to status
+  .redeem_eco      // for legacy mapping to eco_price
+} AS o
+"""
+
+
+async def _offers_payload(
+    s: AsyncSession,
+    user_id: str,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    *,
+    ensure: bool = True,
+) -> List[Dict[str, Any]]:
+    params = {"uid": user_id, "limit": int(limit), "cursor": cursor}
+    rows = await _owner_values(s, _OFFERS_Q, params, ("o",), ensure=ensure)
+    return [_offer_dict(o) for (o,) in rows]
+
+
 @router.get("/offers", response_model=List[OfferOut])
-def list_offers(
+async def list_offers(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Keyset cursor: id of the last offer seen"),
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
     """
     Business-owner view of their offers.
@@ -408,41 +551,52 @@ def list_offers(
     - (o)-[:OF]->(b)
 
     and normalises legacy fields into the new eco_price / status shape.
+    Paged in Neo4j: pass the last returned id as `cursor` for the next page.
     """
-    _ensure_owner_business(s, user_id)
-    cy = """
-    MATCH (b:BusinessProfile {user_id: $uid})
-    OPTIONAL MATCH (b)-[:HAS_OFFER]->(a:Offer)
-    OPTIONAL MATCH (o:Offer)-[:OF]->(b)
-    WITH b, coalesce(a, o) AS o
-    WHERE o IS NOT NULL
-    WITH collect(DISTINCT o) AS os
-    UNWIND os AS o
-    ORDER BY coalesce(o.valid_until, '') DESC, o.title
-    RETURN o {
-      .id,
-      .title,
-      .blurb,
-      .status,
-      .eco_price,
-      .fiat_cost_cents,
-      .stock,
-      .url,
-      .valid_until,
-      .tags,
-      .visible,        // for legacy mapping to status
-      .redeem_eco      // for legacy mapping to eco_price
-    } AS o
-    """
-    rows = _all(s, cy, {"uid": user_id})
-    return [_offer_record_to_out(r) for r in rows]
+    # Rows are normalised into the OfferOut shape; response_model stays for the
+    # schema, returning the response directly skips re-validating each row.
+    return ORJSONResponse(await _offers_payload(s, user_id, limit, cursor))
+
+
+_CREATE_OFFER_Q = """
+CREATE (o:Offer {
+  id: $oid,
+  title: $title,
+  blurb: $blurb,
+  status: $status,
+  eco_price: $eco_price,
+  fiat_cost_cents: $fiat_cost_cents,
+  stock: $stock,
+  url: $url,
+  valid_until: $vu,
+  tags: $tags,
+  claims: coalesce($claims, 0),
+  created_at: datetime(),
+  updated_at: datetime()
+})
+MERGE (b)-[:HAS_OFFER]->(o)
+MERGE (o)-[:OF]->(b)        // keep both directions for compatibility
+""" + OFFER_TAGS_SYNC + """
+RETURN o {
+  .id,
+  .title,
+  .blurb,
+  .status,
+  .eco_price,
+  .fiat_cost_cents,
+  .stock,
+  .url,
+  .valid_until,
+  .tags
+} AS o
+"""
 
 
 @router.post("/offers", response_model=OfferOut, status_code=status.HTTP_201_CREATED)
-def create_offer(
+async def create_offer(
     payload: OfferIn,
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
     """
     Create a new business offer with the upgraded schema:
@@ -451,43 +605,10 @@ def create_offer(
     - fiat_cost_cents (for sponsor payouts)
     - stock, url, valid_until, tags
     """
-    _ensure_owner_business(s, user_id)
     oid = str(uuid4())
-    cy = """
-    MATCH (b:BusinessProfile {user_id: $uid})
-    CREATE (o:Offer {
-      id: $oid,
-      title: $title,
-      blurb: $blurb,
-      status: $status,
-      eco_price: $eco_price,
-      fiat_cost_cents: $fiat_cost_cents,
-      stock: $stock,
-      url: $url,
-      valid_until: $vu,
-      tags: $tags,
-      claims: coalesce($claims, 0),
-      created_at: datetime(),
-      updated_at: datetime()
-    })
-    MERGE (b)-[:HAS_OFFER]->(o)
-    MERGE (o)-[:OF]->(b)        // keep both directions for compatibility
-    RETURN o {
-      .id,
-      .title,
-      .blurb,
-      .status,
-      .eco_price,
-      .fiat_cost_cents,
-      .stock,
-      .url,
-      .valid_until,
-      .tags
-    } AS o
-    """
-    rec = _one(
+    rec = await _owner_one(
         s,
-        cy,
+        _CREATE_OFFER_Q,
         {
             "uid": user_id,
             "oid": oid,
@@ -506,49 +627,50 @@ def create_offer(
     return _offer_record_to_out(rec)
 
 
+_PATCH_OFFER_Q = """
+OPTIONAL MATCH (b)-[:HAS_OFFER]->(o1:Offer {id:$oid})
+OPTIONAL MATCH (o2:Offer {id:$oid})-[:OF]->(b)
+WITH coalesce(o1, o2) AS o
+WHERE o IS NOT NULL
+SET o.title           = $title,
+    o.blurb           = $blurb,
+    o.status          = $status,
+    o.eco_price       = $eco_price,
+    o.fiat_cost_cents = $fiat_cost_cents,
+    o.stock           = $stock,
+    o.url             = $url,
+    o.valid_until     = $vu,
+    o.tags            = $tags,
+    o.updated_at      = datetime()
+""" + OFFER_TAGS_SYNC + """
+RETURN o {
+  .id,
+  .title,
+  .blurb,
+  .status,
+  .eco_price,
+  .fiat_cost_cents,
+  .stock,
+  .url,
+  .valid_until,
+  .tags
+} AS o
+"""
+
+
 @router.patch("/offers/{offer_id}", response_model=OfferOut)
-def patch_offer(
+async def patch_offer(
     offer_id: str,
     payload: OfferIn,
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
     """
     Full update of an offer (FE sends the complete offer payload).
     """
-    _ensure_owner_business(s, user_id)
-    cy = """
-    MATCH (b:BusinessProfile {user_id: $uid})
-    OPTIONAL MATCH (b)-[:HAS_OFFER]->(o1:Offer {id:$oid})
-    OPTIONAL MATCH (o2:Offer {id:$oid})-[:OF]->(b)
-    WITH coalesce(o1, o2) AS o
-    WHERE o IS NOT NULL
-    SET o.title           = $title,
-        o.blurb           = $blurb,
-        o.status          = $status,
-        o.eco_price       = $eco_price,
-        o.fiat_cost_cents = $fiat_cost_cents,
-        o.stock           = $stock,
-        o.url             = $url,
-        o.valid_until     = $vu,
-        o.tags            = $tags,
-        o.updated_at      = datetime()
-    RETURN o {
-      .id,
-      .title,
-      .blurb,
-      .status,
-      .eco_price,
-      .fiat_cost_cents,
-      .stock,
-      .url,
-      .valid_until,
-      .tags
-    } AS o
-    """
-    rec = _one(
+    rec = await _owner_one(
         s,
-        cy,
+        _PATCH_OFFER_Q,
         {
             "uid": user_id,
             "oid": offer_id,
@@ -568,196 +690,178 @@ def patch_offer(
     return _offer_record_to_out(rec)
 
 
+_DELETE_OFFER_Q = """
+OPTIONAL MATCH (b)-[:HAS_OFFER]->(o1:Offer {id:$oid})
+OPTIONAL MATCH (o2:Offer {id:$oid})-[:OF]->(b)
+WITH coalesce(o1, o2) AS o
+WITH o,
+     CASE WHEN o IS NULL THEN 0 ELSE 1 END AS deleted
+FOREACH (_ IN CASE WHEN o IS NULL THEN [] ELSE [1] END |
+  DETACH DELETE o
+)
+RETURN deleted AS deleted
+"""
+
+
 @router.delete("/offers/{offer_id}", response_model=dict)
-def delete_offer(
+async def delete_offer(
     offer_id: str,
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
     """
     Delete an offer owned by this business using a pure-Cypher FOREACH pattern
     (no APOC), to avoid the `Variable o not defined` errors.
     """
-    _ensure_owner_business(s, user_id)
-    cy = """
-    MATCH (b:BusinessProfile {user_id:$uid})
-    OPTIONAL MATCH (b)-[:HAS_OFFER]->(o1:Offer {id:$oid})
-    OPTIONAL MATCH (o2:Offer {id:$oid})-[:OF]->(b)
-    WITH coalesce(o1, o2) AS o
-    WITH o,
-         CASE WHEN o IS NULL THEN 0 ELSE 1 END AS deleted
-    FOREACH (_ IN CASE WHEN o IS NULL THEN [] ELSE [1] END |
-      DETACH DELETE o
-    )
-    RETURN deleted AS deleted
-    """
-    rec = _one(s, cy, {"uid": user_id, "oid": offer_id})
+    rec = await _owner_one(s, _DELETE_OFFER_Q, {"uid": user_id, "oid": offer_id})
     if not rec or int(rec.get("deleted") or 0) == 0:
         raise HTTPException(status_code=404, detail="Offer not found")
     return {"ok": True}
 
 
+_ACTIVITY_Q = """
+MATCH (b:BusinessProfile {user_id:$uid})
+
+CALL {
+  WITH b
+  // Inbound: contributions collected by the business
+  MATCH (b)-[:COLLECTED]->(tin:EcoTx)
+  WHERE coalesce(tin.status,'settled')='settled'
+    AND (coalesce(tin.kind,'')='CONTRIBUTE' OR tin.source='contribution' OR tin.source='eco_local')
+  RETURN
+    tin.id AS id,
+    toInteger(coalesce(tin.createdAt, tin.at.epochMillis, timestamp())) AS ts,
+    tin.user_id AS user_id,
+    coalesce(tin.kind,'CONTRIBUTE') AS kind,
+    toFloat(coalesce(tin.eco, tin.amount)) AS amount,
+    NULL AS offer_id
+  ORDER BY ts DESC
+  LIMIT $limit
+  UNION ALL
+  WITH b
+  // Outbound: rewards/payouts initiated by the business
+  MATCH (b)-[r]->(tout:EcoTx)
+  WHERE coalesce(tout.status,'settled')='settled'
+    AND type(r) IN ['SPENT','COLLECTED','EARNED']
+    AND coalesce(tout.kind,'') IN ['BURN_REWARD','SPONSOR_PAYOUT']
+  RETURN
+    tout.id AS id,
+    toInteger(coalesce(tout.createdAt, tout.at.epochMillis, timestamp())) AS ts,
+    tout.user_id AS user_id,
+    coalesce(tout.kind,'BURN_REWARD') AS kind,
+    toFloat(coalesce(tout.eco, tout.amount)) AS amount,
+    tout.offer_id AS offer_id
+  ORDER BY ts DESC
+  LIMIT $limit
+}
+// Each arm is already cut to its newest $limit rows; merge those on the integer
+// millis and format only the rows that survive the outer LIMIT.
+WITH id, ts, user_id, kind, amount, offer_id
+ORDER BY ts DESC
+LIMIT $limit
+RETURN id, toString(datetime({epochMillis: ts})) AS createdAt, user_id, kind, amount, offer_id
+"""
+
+
+async def _activity_payload(s: AsyncSession, user_id: str, limit: int) -> List[Dict[str, Any]]:
+    rows = await _values(
+        s, _ACTIVITY_Q, {"uid": user_id, "limit": int(limit)},
+        ("id", "createdAt", "user_id", "kind", "amount", "offer_id"),
+    )
+    return [
+        {
+            "id": id_ or str(uuid4()),
+            "createdAt": created_at or datetime.now(timezone.utc).isoformat(),
+            "user_id": uid,
+            "kind": kind or "event",
+            "amount": float(amount or 0.0),
+            "offer_id": offer_id,
+        }
+        for id_, created_at, uid, kind, amount, offer_id in rows
+    ]
+
+
 @router.get("/activity", response_model=List[ActivityRow])
-def business_recent_activity(
+async def business_recent_activity(
     limit: int = 50,
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
-    cy = """
-    MATCH (b:BusinessProfile {user_id:$uid})
-
-    CALL {
-      WITH b
-      // Inbound: contributions collected by the business
-      MATCH (b)-[:COLLECTED]->(tin:EcoTx)
-      WHERE coalesce(tin.status,'settled')='settled'
-        AND (coalesce(tin.kind,'')='CONTRIBUTE' OR tin.source='contribution' OR tin.source='eco_local')
-      RETURN
-        tin.id AS id,
-        toString(datetime({epochMillis: toInteger(coalesce(tin.createdAt, timestamp(tin.at), timestamp()))})) AS createdAt,
-        tin.user_id AS user_id,
-        coalesce(tin.kind,'CONTRIBUTE') AS kind,
-        toFloat(coalesce(tin.eco, tin.amount)) AS amount,
-        NULL AS offer_id
-      UNION ALL
-      WITH b
-      // Outbound: rewards/payouts initiated by the business
-      MATCH (b)-[r]->(tout:EcoTx)
-      WHERE coalesce(tout.status,'settled')='settled'
-        AND type(r) IN ['SPENT','COLLECTED','EARNED']
-        AND coalesce(tout.kind,'') IN ['BURN_REWARD','SPONSOR_PAYOUT']
-      RETURN
-        tout.id AS id,
-        toString(datetime({epochMillis: toInteger(coalesce(tout.createdAt, timestamp(tout.at), timestamp()))})) AS createdAt,
-        tout.user_id AS user_id,
-        coalesce(tout.kind,'BURN_REWARD') AS kind,
-        toFloat(coalesce(tout.eco, tout.amount)) AS amount,
-        tout.offer_id AS offer_id
-    }
-    RETURN id, createdAt, user_id, kind, amount, offer_id
-    ORDER BY datetime(createdAt) DESC
-    LIMIT $limit
-    """
-    rows = _all(s, cy, {"uid": user_id, "limit": int(limit)})
+    return ORJSONResponse(await _activity_payload(s, user_id, limit))
 
-    out: list[ActivityRow] = []
-    for r in rows:
-        out.append(
-            ActivityRow(
-                id=r.get("id") or str(uuid4()),
-                createdAt=r.get("createdAt") or datetime.now(timezone.utc).isoformat(),
-                user_id=r.get("user_id"),
-                kind=r.get("kind") or "event",
-                amount=float(r.get("amount") or 0.0),
-                offer_id=r.get("offer_id"),
-            )
-        )
 
-    return out
+# (Ensure +) SET + QR lookup (canonical (:QR)-[:OF]->(b)) in one round trip.
+_PATCH_PROFILE_Q = """
+SET b += $fields
+WITH b
+OPTIONAL MATCH (q:QR)-[:OF]->(b)
+RETURN b {
+  .id, .name, .tagline, .website, .address, .hours, .description,
+  .hero_url, .lat, .lng, .visible_on_map, .tags,
+  .pledge_tier, .rules_first_visit, .rules_return_visit, .rules_cooldown_hours,
+  .rules_daily_cap_per_user, .rules_geofence_radius_m
+} AS b, q.code AS qr
+"""
 
 
 @router.patch("/profile", response_model=BusinessMine)
-def patch_profile(
+async def patch_profile(
     patch: PatchProfile,
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
     """
     No APOC: explicitly SET only provided fields (accepts rule fields to avoid 422).
     """
-    _ensure_owner_business(s, user_id)
-
-    # Build dynamic SETs based on provided keys
     fields_map = patch.dict(exclude_unset=True)
 
     # Normalise FE "disable" semantics for geofence: FE may send null/""; if "", drop it.
     if "rules_geofence_radius_m" in fields_map and fields_map["rules_geofence_radius_m"] in ("", None):
         fields_map["rules_geofence_radius_m"] = None
 
-    if not fields_map:
-        b = _get_business(s, user_id)
-        if not b:
-            raise HTTPException(status_code=404, detail="Business not found")
-        return b
-
-    set_lines = []
-    params: Dict[str, Any] = {"uid": user_id}
-    for k, v in fields_map.items():
-        set_lines.append(f"b.{k} = ${k}")
-        params[k] = v
-
-    cy = f"""
-    MATCH (b:BusinessProfile {{user_id:$uid}})
-    SET {", ".join(set_lines)}
-    RETURN b {{
-      .id, .name, .tagline, .website, .address, .hours, .description,
-      .hero_url, .lat, .lng, .visible_on_map, .tags,
-      .pledge_tier, .rules_first_visit, .rules_return_visit, .rules_cooldown_hours,
-      .rules_daily_cap_per_user, .rules_geofence_radius_m
-    }} AS b
-    """
-    rec = _one(s, cy, params)
+    # One static query text for every patch: `SET b += $fields` writes exactly the
+    # provided keys (a null value removes the property, same as `SET b.k = null`).
+    rec = await _owner_one(s, _PATCH_PROFILE_Q, {"uid": user_id, "fields": fields_map})
     if not rec:
         raise HTTPException(status_code=404, detail="Business not found")
-
-    # Add QR (if any)... canonical shape (:QR)-[:OF]->(b)
-    cy_qr = """
-    MATCH (b:BusinessProfile {user_id:$uid})
-    OPTIONAL MATCH (q:QR)-[:OF]->(b)
-    RETURN q.code AS qr
-    """
-    qr = (_one(s, cy_qr, {"uid": user_id}) or {}).get("qr")
+    qr = rec.get("qr")
 
     b = rec.get("b") or {}
-    return BusinessMine(
-        id=b.get("id"),
-        name=b.get("name"),
-        tagline=b.get("tagline"),
-        website=b.get("website"),
-        address=b.get("address"),
-        hours=b.get("hours"),
-        description=b.get("description"),
-        hero_url=b.get("hero_url"),
-        lat=b.get("lat"),
-        lng=b.get("lng"),
-        visible_on_map=b.get("visible_on_map", True),
-        tags=b.get("tags") or [],
-        qr_code=qr,
-        pledge_tier=b.get("pledge_tier"),
-        rules_first_visit=b.get("rules_first_visit"),
-        rules_return_visit=b.get("rules_return_visit"),
-        rules_cooldown_hours=b.get("rules_cooldown_hours"),
-        rules_daily_cap_per_user=b.get("rules_daily_cap_per_user"),
-        rules_geofence_radius_m=b.get("rules_geofence_radius_m"),
-    )
+    if fields_map:
+        invalidate_qr_meta(b.get("id"))
+    return _row_to_business(b, qr)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Asset upload (hero image)
 # ─────────────────────────────────────────────────────────────────────────────
 
+_SET_HERO_Q = """
+MATCH (b:BusinessProfile {user_id:$uid})
+SET b.hero_url = $url
+"""
+
+
 @assets_router.post("/hero_upload")
-def hero_upload(
+async def hero_upload(
     file: UploadFile = File(...),
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
     os.makedirs(UPLOAD_DIR, exist_ok=True)
     ext = os.path.splitext(file.filename or "")[1] or ".bin"
     name = f"{uuid4().hex}{ext}"
     disk_path = os.path.join(UPLOAD_DIR, name)
-    with open(disk_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    # Copy in fixed-size chunks; reads and writes both run off the event loop.
+    async with await anyio.open_file(disk_path, "wb") as f:
+        while chunk := await file.read(_UPLOAD_CHUNK):
+            await f.write(chunk)
 
     # Path served by your StaticFiles (adjust if your static mount differs)
     public_path = f"/{UPLOAD_DIR}/{name}".replace("//", "/")
 
-    cy = """
-    MATCH (b:BusinessProfile {user_id:$uid})
-    SET b.hero_url = $url
-    """
-    s.run(cy, uid=user_id, url=public_path).consume()
+    await (await s.run(_SET_HERO_Q, uid=user_id, url=public_path)).consume()
 
-    return {"path": public_path, "url": public_path}
+    return ORJSONResponse({"path": public_path, "url": public_path})
 
 # ── Analytics models (unchanged) ─────────────────────────────
 
@@ -804,151 +908,221 @@ def _utc_day(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).date().isoformat()
 
 
+def _since_ms(days: int) -> int:
+    """Window start as epoch millis, passed to Cypher as $since_ms."""
+    return int((datetime.now(timezone.utc) - timedelta(days=int(days))).timestamp() * 1000)
+
+
+_DAILY_Q = """
+// inbound minted
+MATCH (b)-[:COLLECTED]->(tin:EcoTx {status:'settled'})
+WITH b, tin, toInteger(coalesce(tin.createdAt, tin.at.epochMillis)) AS ms
+WHERE ms >= $since_ms
+WITH b,
+     date(datetime({epochMillis: ms})) AS d,
+     toInteger(coalesce(tin.eco, tin.amount, 0)) AS eco_in
+WITH b, d, sum(eco_in) AS minted
+
+// outbound retired on same day d
+OPTIONAL MATCH (b)-[:SPENT]->(tout:EcoTx {status:'settled'})
+WHERE coalesce(tout.kind,'')='BURN_REWARD'
+  AND toInteger(coalesce(tout.createdAt, tout.at.epochMillis)) >= $since_ms
+  AND date(datetime({epochMillis: toInteger(coalesce(tout.createdAt, tout.at.epochMillis))})) = d
+WITH d, minted,
+     sum( toInteger(coalesce(tout.eco, tout.amount, 0)) ) AS retired
+RETURN d AS day, toInteger(minted) AS minted, toInteger(coalesce(retired,0)) AS retired
+ORDER BY day ASC
+"""
+
+
+async def _daily_payload(
+    s: AsyncSession, user_id: str, days: int, *, ensure: bool = True
+) -> Dict[str, Any]:
+    """
+    Roll up per-UTC-day for inbound COLLECTED and outbound BURN_REWARD.
+    """
+    rows = await _owner_values(
+        s, _DAILY_Q, {"uid": user_id, "since_ms": _since_ms(days)},
+        ("day", "minted", "retired"), ensure=ensure,
+    )
+    points = []
+    for day, minted, retired in rows:
+        minted = int(minted or 0)
+        retired = int(retired or 0)
+        points.append({"day": str(day), "minted": minted, "retired": retired, "net": minted - retired})
+    return {"points": points}
+
+
 @router.get("/analytics/daily", response_model=DailySeriesOut)
-def analytics_daily(
+async def analytics_daily(
     days: int = 90,
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
     """
     Roll up per-UTC-day for inbound COLLECTED and outbound BURN_REWARD.
     """
-    _ensure_owner_business(s, user_id)
-    cy = """
-    MATCH (b:BusinessProfile {user_id:$uid})
-    WITH b, datetime() - duration({days:$days}) AS since
-
-    // inbound minted
-    MATCH (b)-[:COLLECTED]->(tin:EcoTx {status:'settled'})
-    WHERE coalesce(tin.at, datetime({epochMillis:tin.createdAt})) >= since
-    WITH b, since,
-         date(coalesce(tin.at, datetime({epochMillis:tin.createdAt}))) AS d,
-         toInteger(coalesce(tin.eco, tin.amount, 0)) AS eco_in
-    WITH b, since, d, sum(eco_in) AS minted
-
-    // outbound retired on same day d
-    OPTIONAL MATCH (b)-[:SPENT]->(tout:EcoTx {status:'settled'})
-    WHERE coalesce(tout.kind,'')='BURN_REWARD'
-      AND date(coalesce(tout.at, datetime({epochMillis:tout.createdAt}))) = d
-      AND coalesce(tout.at, datetime({epochMillis:tout.createdAt})) >= since
-    WITH d, minted,
-         sum( toInteger(coalesce(tout.eco, tout.amount, 0)) ) AS retired
-    RETURN d AS day, toInteger(minted) AS minted, toInteger(coalesce(retired,0)) AS retired
-    ORDER BY day ASC
-    """
-    rows = _all(s, cy, {"uid": user_id, "days": int(days)})
-    points = []
-    for r in rows:
-        day = str(r["day"])
-        minted = int(r["minted"] or 0)
-        retired = int(r["retired"] or 0)
-        points.append({"day": day, "minted": minted, "retired": retired, "net": minted - retired})
-    return {"points": points}
+    return ORJSONResponse(await _daily_payload(s, user_id, days))
+
+
+_BUSY_Q = """
+CALL {
+  WITH b
+  MATCH (b)-[:COLLECTED]->(t:EcoTx {status:'settled'})
+  WHERE (
+    coalesce(t.kind,'')='MINT_ACTION'
+    OR coalesce(t.source,'') IN ['qr','contribution','sidequest','eco_local']
+  )
+  WITH t, toInteger(coalesce(t.createdAt, t.at.epochMillis)) AS ms
+  WHERE ms >= $since_ms
+  WITH datetime({epochMillis: ms}).hour AS hr, toInteger(coalesce(t.eco, t.amount, 0)) AS eco
+  WITH hr, count(*) AS claims, sum(eco) AS eco
+  RETURN collect({k: hr, claims: claims, eco: eco}) AS by_hour
+}
+CALL {
+  WITH b
+  MATCH (b)-[:COLLECTED]->(t:EcoTx {status:'settled'})
+  WHERE (
+    coalesce(t.kind,'')='MINT_ACTION'
+    OR coalesce(t.source,'') IN ['qr','contribution','sidequest','eco_local']
+  )
+  WITH t, toInteger(coalesce(t.createdAt, t.at.epochMillis)) AS ms
+  WHERE ms >= $since_ms
+  // dayOfWeek is 1=Mon..7=Sun; % 7 gives 0=Sun..6=Sat to match the labels
+  WITH datetime({epochMillis: ms}).dayOfWeek % 7 AS wd, toInteger(coalesce(t.eco, t.amount, 0)) AS eco
+  WITH wd, count(*) AS claims, sum(eco) AS eco
+  RETURN collect({k: wd, claims: claims, eco: eco}) AS by_weekday
+}
+RETURN by_hour, by_weekday
+"""
 
 
 @router.get("/analytics/busy", response_model=BusyOut)
-def analytics_busy(
+async def analytics_busy(
     days: int = 90,
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
     """
     Busiest hours and weekdays (claims + ECO).
     - Parenthesized WHERE to ensure the time-window applies to both kind/source branches.
     """
-    _ensure_owner_business(s, user_id)
-    cy = """
-    MATCH (b:BusinessProfile {user_id:$uid})
-    WITH b, datetime() - duration({days:$days}) AS since
-    MATCH (b)-[:COLLECTED]->(t:EcoTx {status:'settled'})
-    WHERE (
-      coalesce(t.kind,'')='MINT_ACTION'
-      OR coalesce(t.source,'') IN ['qr','contribution','sidequest','eco_local']
-    ) AND coalesce(t.at, datetime({epochMillis:t.createdAt})) >= since
-    WITH
-      time(coalesce(t.at, datetime({epochMillis:t.createdAt}))).hour AS hr,
-      coalesce(t.user_id, substring(coalesce(t.source,"anon"),0,16)) AS who,
-      toInteger(coalesce(t.eco, t.amount, 0)) AS eco,
-      date(coalesce(t.at, datetime({epochMillis:t.createdAt}))).weekday AS wd
-    RETURN
-      hr, wd,
-      count(*) AS claims,
-      sum(eco) AS eco
-    """
-    rows = _all(s, cy, {"uid": user_id, "days": int(days)})
-
-    hour = {i: {"claims": 0, "eco": 0} for i in range(24)}
-    dow = {i: {"claims": 0, "eco": 0} for i in range(7)}
+    rec = await _owner_one(s, _BUSY_Q, {"uid": user_id, "since_ms": _since_ms(days)}) or {}
 
-    for r in rows:
-        hr = int(r["hr"] or 0)
-        wd = int(r["wd"] or 0)
-        hour[hr]["claims"] += int(r["claims"] or 0)
-        hour[hr]["eco"] += int(r["eco"] or 0)
-        dow[wd]["claims"] += int(r["claims"] or 0)
-        dow[wd]["eco"] += int(r["eco"] or 0)
+    # Pre-summed buckets (at most 24 + 7); fill the empty slots with zeros.
+    zero = {"claims": 0, "eco": 0}
+    hour = {int(r["k"]): r for r in rec.get("by_hour") or []}
+    dow = {int(r["k"]): r for r in rec.get("by_weekday") or []}
 
     names = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
     return {
         "by_hour": [
-            {"label": f"{h:02d}:00", "claims": hour[h]["claims"], "eco": hour[h]["eco"]}
+            {
+                "label": f"{h:02d}:00",
+                "claims": int(hour.get(h, zero)["claims"] or 0),
+                "eco": int(hour.get(h, zero)["eco"] or 0),
+            }
             for h in range(24)
         ],
         "by_weekday": [
-            {"label": names[d], "claims": dow[d]["claims"], "eco": dow[d]["eco"]}
+            {
+                "label": names[d],
+                "claims": int(dow.get(d, zero)["claims"] or 0),
+                "eco": int(dow.get(d, zero)["eco"] or 0),
+            }
             for d in range(7)
         ],
     }
 
 
+_VISITORS_Q = """
+MATCH (b)-[:COLLECTED]->(t:EcoTx {status:'settled'})
+WITH t, toInteger(coalesce(t.createdAt, t.at.epochMillis)) AS ms
+WHERE ms >= $since_ms
+WITH coalesce(t.user_id, "device:" + substring(coalesce(t.source,"anon"),0,16)) AS id,
+     ms,
+     toInteger(coalesce(t.eco, t.amount, 0)) AS eco
+RETURN id,
+       min(ms) AS first_at,
+       max(ms) AS last_at,
+       count(*) AS claims,
+       sum(eco) AS minted_eco
+ORDER BY claims DESC, last_at DESC
+LIMIT $limit
+"""
+
+
 @router.get("/analytics/visitors", response_model=VisitorsOut)
-def analytics_visitors(
+async def analytics_visitors(
     days: int = 90,
     limit: int = 50,
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
     """
     Unique visitors over window; groups by user_id when present, else a device-ish surrogate.
     """
-    _ensure_owner_business(s, user_id)
-    cy = """
-    MATCH (b:BusinessProfile {user_id:$uid})
-    WITH b, datetime() - duration({days:$days}) AS since
-    MATCH (b)-[:COLLECTED]->(t:EcoTx {status:'settled'})
-    WHERE coalesce(t.at, datetime({epochMillis:t.createdAt})) >= since
-    WITH coalesce(t.user_id, "device:" + substring(coalesce(t.source,"anon"),0,16)) AS id,
-         toInteger(coalesce(t.createdAt, timestamp(t.at), timestamp())) AS ms,
-         toInteger(coalesce(t.eco, t.amount, 0)) AS eco
-    RETURN id,
-           min(ms) AS first_at,
-           max(ms) AS last_at,
-           count(*) AS claims,
-           sum(eco) AS minted_eco
-    ORDER BY claims DESC, last_at DESC
-    LIMIT $limit
-    """
-    rows = _all(s, cy, {"uid": user_id, "days": int(days), "limit": int(limit)})
+    rows = await _owner_values(
+        s, _VISITORS_Q, {"uid": user_id, "since_ms": _since_ms(days), "limit": int(limit)},
+        ("id", "first_at", "last_at", "claims", "minted_eco"),
+    )
     return {
         "items": [
             {
-                "id": r["id"],
-                "first_at": int(r["first_at"] or 0),
-                "last_at": int(r["last_at"] or 0),
-                "claims": int(r["claims"] or 0),
-                "minted_eco": int(r["minted_eco"] or 0),
+                "id": id_,
+                "first_at": int(first_at or 0),
+                "last_at": int(last_at or 0),
+                "claims": int(claims or 0),
+                "minted_eco": int(minted_eco or 0),
             }
-            for r in rows
+            for id_, first_at, last_at, claims, minted_eco in rows
         ]
     }
 
 
 @router.get("/analytics/abuse", response_model=AbuseOut)
-def analytics_abuse(
+async def analytics_abuse(
     days: int = 30,
     user_id: str = Depends(current_user_id),
-    s: Session = Depends(session_dep),
+    s: AsyncSession = Depends(async_session_dep),
 ):
-    _ensure_owner_business(s, user_id)
+    await _ensure_owner_business(s, user_id)
     # TODO: replace with your real reject logs when available
     return {"cooldown_hits": 0, "daily_cap_hits": 0}
+
+
+# ── Owner dashboard (one request instead of five) ─────────────
+
+@router.get("/dashboard", response_model=Dict[str, Any])
+async def owner_dashboard(
+    days: int = 90,
+    limit: int = 50,
+    user_id: str = Depends(current_user_id),
+    driver: AsyncDriver = Depends(async_driver_dep),
+):
+    """
+    mine + metrics + offers + activity + analytics/daily in one response.
+    The business is ensured once; the five reads then run concurrently, one
+    session each (an AsyncSession runs a single query at a time).
+    """
+    async with driver.session(**SESSION_OPTS) as s:
+        await _ensure_owner_business(s, user_id)
+
+    async def _read(load, *args, **kwargs):
+        async with driver.session(**SESSION_OPTS) as s:
+            return await load(s, user_id, *args, **kwargs)
+
+    mine, metrics, offers, activity, daily = await asyncio.gather(
+        _read(_mine_payload),
+        _read(_metrics_payload, ensure=False),
+        _read(_offers_payload, ensure=False),
+        _read(_activity_payload, limit),
+        _read(_daily_payload, days, ensure=False),
+    )
+    return ORJSONResponse({
+        "business": mine,
+        "metrics": metrics,
+        "offers": offers,
+        "activity": activity,
+        "daily": daily,
+    })
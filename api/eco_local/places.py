@@ -4,11 +4,13 @@ from __future__ import annotations
 from typing import Optional, List, Literal, Tuple, Dict, Any
 from fastapi import APIRouter, Depends, Query, HTTPException
 from pydantic import BaseModel, Field
-from math import radians, sin, cos, atan2, sqrt
+import numpy as np
 from neo4j import Session
 from inspect import signature
+from functools import lru_cache
 
 from site_backend.core.neo_driver import session_dep
+from site_backend.api.services.neo_places import list_places_with_offer_flag
 
 router = APIRouter(prefix="/eco-local", tags=["eco-local"])
 
@@ -43,14 +45,13 @@ class PlacesResponse(BaseModel):
     page_size: int
 
 # -------- Helpers --------
-def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371.0
-    phi1 = radians(lat1); phi2 = radians(lat2)
-    dphi = radians(lat2 - lat1)
-    dl   = radians(lon2 - lon1)
-    a = sin(dphi / 2) ** 2 + cos(phi1) * cos(phi2) * sin(dl / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    return R * c
+def _haversine_km_vec(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Distances (km) from one point to many, in a single NumPy pass."""
+    phi1 = np.radians(lat); phi2 = np.radians(lats)
+    dphi = phi2 - phi1
+    dl   = np.radians(lngs - lng)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dl / 2) ** 2
+    return 6371.0 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
 
 def _tier_rank(t: Optional[str]) -> int:
     return {"starter": 1, "builder": 2, "leader": 3}.get((t or "").lower(), 0)
@@ -73,9 +74,12 @@ def _merge_multi_and_csv(multi: Optional[List[str]], csv: Optional[str]) -> Opti
     if csv:   out.extend([s.strip() for s in csv.split(",") if s.strip()])
     return out or None
 
+@lru_cache(maxsize=8)
+def _accepted_params(svc) -> frozenset:
+    return frozenset(signature(svc).parameters.keys())
+
 def _call_service_safely(svc, s: Session, kwargs: Dict[str, Any]):
-    sig = signature(svc)
-    accepted = set(sig.parameters.keys())
+    accepted = _accepted_params(svc)
     filtered = {k: v for k, v in kwargs.items() if k in accepted and v is not None}
     return svc(s, **filtered)
 
@@ -136,7 +140,6 @@ def get_places(
         lat=lat, lng=lng, user_lat=lat, user_lng=lng,
         page=page, page_size=page_size,
     )
-    from site_backend.api.services.neo_places import list_places_with_offer_flag
     raw = _call_service_safely(list_places_with_offer_flag, s, svc_kwargs)
 
     if isinstance(raw, dict):
@@ -150,12 +153,15 @@ def get_places(
         data = raw  # type: ignore
 
     if sort == "distance" and lat is not None and lng is not None:
-        for i, p in enumerate(data.items):
-            if p.distance_km is None:
-                try:
-                    data.items[i].distance_km = round(_haversine_km(lat, lng, p.lat, p.lng), 2)
-                except Exception:
-                    pass
+        missing = [p for p in data.items if p.distance_km is None and p.lat is not None and p.lng is not None]
+        if missing:
+            d = _haversine_km_vec(
+                lat, lng,
+                np.fromiter((p.lat for p in missing), dtype=float, count=len(missing)),
+                np.fromiter((p.lng for p in missing), dtype=float, count=len(missing)),
+            ).round(2)
+            for p, km in zip(missing, d.tolist()):
+                p.distance_km = km
         data.items.sort(key=lambda x: (x.distance_km if x.distance_km is not None else 1e9, (x.name or "").lower()))
     elif sort == "name":
         data.items.sort(key=lambda x: (x.name or "").lower())
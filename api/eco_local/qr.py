@@ -4,8 +4,10 @@ from __future__ import annotations
 import io
 import re
 import qrcode
+from functools import lru_cache
+from hashlib import blake2b
 from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from neo4j import Session
 
 from site_backend.core.neo_driver import session_dep
@@ -119,12 +121,25 @@ def _is_visible(o: Dict[str, Any]) -> bool:
             return False
     return True
 
+@lru_cache(maxsize=256)
+def _qr_png(value: str, size: int) -> bytes:
+    """PNG bytes for a QR payload; deterministic, so cached per worker."""
+    qr = qrcode.QRCode(version=None, error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=10, border=3)
+    qr.add_data(value)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white").resize((size, size))
+
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
 # ─────────────────────────────────────────────────────────
 # QR image for owners
 # ─────────────────────────────────────────────────────────
 
 @router.get("/business.png")
 def business_qr_png(
+    req: Request,
     s: Session = Depends(session_dep),
     user_id: str = Depends(current_user_id),
     business_id: str = Query(..., description="Your business id"),
@@ -134,14 +149,12 @@ def business_qr_png(
     code = _owned_qr_code(s, user_id=user_id, business_id=business_id)
     value = app_payload_for_code(code) if kind == "app" else short_url_for_code(code)
 
-    qr = qrcode.QRCode(version=None, error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=10, border=3)
-    qr.add_data(value)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white").resize((size, size))
-
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    return Response(content=buf.getvalue(), media_type="image/png")
+    # Same payload + size => same image; let the browser revalidate with a 304.
+    etag = f'"{blake2b(f"{value}|{size}".encode(), digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=86400"}
+    if req.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=_qr_png(value, size), media_type="image/png", headers=headers)
 
 # ─────────────────────────────────────────────────────────
 # PUBLIC: Offers by scanned QR
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import hashlib
-from datetime import datetime, timezone, timedelta
+from time import time_ns
 from typing import Optional, List, Literal, Dict, Any, Tuple
 
-from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from neo4j import Session
 from pydantic import BaseModel, Field
 
@@ -15,14 +15,13 @@ router = APIRouter(prefix="/eco-local", tags=["eco-local"])
 
 # ---------- helpers ----------
 def _now_ms() -> int:
-    return int(datetime.now(timezone.utc).timestamp() * 1000)
+    return time_ns() // 1_000_000
 
 
 def _device_hash(ip: str, ua: str) -> str:
-    h = hashlib.sha256()
-    h.update((ip or "-").encode())
-    h.update((ua or "-").encode())
-    return h.hexdigest()[:16]
+    # Guest wallet ids (y_<hash>) are persisted, so this must stay SHA-256[:16]
+    # over ip+ua; one-shot constructor instead of two update() calls.
+    return hashlib.sha256((ip or "-").encode() + (ua or "-").encode()).hexdigest()[:16]
 
 
 def _guest_user_id(req: Request) -> str:
@@ -94,7 +93,7 @@ def _youth_totals(s: Session, uid: str) -> Tuple[int, int, int, int]:
     Submissions are *not* counted directly; they only exist as proof
     and connectors that may have minted those EcoTx.
     """
-    thirty_days_ms = int((datetime.now(timezone.utc) - timedelta(days=30)).timestamp() * 1000)
+    thirty_days_ms = _now_ms() - 30 * 86_400_000
 
     rec = s.run(
         """
@@ -267,8 +266,6 @@ def _biz_id_for_user(s: Session, uid: str, requested: Optional[str]) -> str:
             {"bid": requested},
         ).single()
         if not row or (row["owner"] or "") != uid:
-            from fastapi import HTTPException
-
             raise HTTPException(status_code=403, detail="Not your business")
         return requested
 
@@ -277,8 +274,6 @@ def _biz_id_for_user(s: Session, uid: str, requested: Optional[str]) -> str:
         {"uid": uid},
     ).single()
     if not row or not row["bid"]:
-        from fastapi import HTTPException
-
         raise HTTPException(status_code=404, detail="No business found for user")
     return row["bid"]
 
@@ -10,6 +10,9 @@ from pydantic import BaseModel
 
 from site_backend.core.neo_driver import session_dep
 from site_backend.core.user_guard import current_user_id
+from site_backend.core.admin_guard import require_admin
+from site_backend.api.eco_local.balance_cache import backfill_eco_balances
+from site_backend.api.eco_local.neo_business import backfill_ecotx_amounts, backfill_offer_tags
 
 # =========================================================
 # Helpers
@@ -519,3 +522,30 @@ def youth_timeseries(
         ))
 
     return TimeSeriesOut(from_month=from_month, to_month=to_month, points=points)
+
+
+@admin_router.post("/utility/backfill-balances")
+def backfill_balances(
+    s: Session = Depends(session_dep),
+    _admin: str = Depends(require_admin),
+):
+    """Recompute User.eco_balance from the EcoTx ledger (run once after deploy, or to repair)."""
+    return backfill_eco_balances(s)
+
+
+@admin_router.post("/utility/backfill-tx-amounts")
+def backfill_tx_amounts(
+    s: Session = Depends(session_dep),
+    _admin: str = Depends(require_admin),
+):
+    """Copy legacy EcoTx.eco into EcoTx.amount where amount is missing."""
+    return backfill_ecotx_amounts(s)
+
+
+@admin_router.post("/utility/backfill-offer-tags")
+def backfill_tags(
+    s: Session = Depends(session_dep),
+    _admin: str = Depends(require_admin),
+):
+    """Mirror existing Offer.tags into (:Offer)-[:TAGGED]->(:Tag) edges."""
+    return backfill_offer_tags(s)
@@ -2,6 +2,8 @@ from __future__ import annotations
 from typing import List, Dict, Optional, Tuple, Any
 from neo4j import Session
 import json
+import threading
+import time
 
 # ───────────────────────────────────────────────────────────────────────────────
 # Level math (derived from total_xp)
@@ -106,7 +108,26 @@ def _user_banned(s: Session, uid: str) -> bool:
     rec = s.run("MATCH (u:User {id:$uid}) RETURN coalesce(u.banned,false) AS b", uid=uid).single()
     return bool(rec and rec.get("b"))
 
+# Seasons change rarely (admin upsert/delete), so the active one is cached per
+# worker; local edits clear it, other workers catch up within the TTL.
+_SEASON_TTL_S = 60.0
+_season_lock = threading.Lock()
+_season_cache: Dict[str, Any] = {"val": None, "exp": 0.0}
+
+def _invalidate_active_season() -> None:
+    with _season_lock:
+        _season_cache["exp"] = 0.0
+
 def _active_season(s: Session) -> Optional[Dict]:
+    if time.monotonic() < _season_cache["exp"]:
+        return _season_cache["val"]
+    season = _load_active_season(s)
+    with _season_lock:
+        _season_cache["val"] = season
+        _season_cache["exp"] = time.monotonic() + _SEASON_TTL_S
+    return season
+
+def _load_active_season(s: Session) -> Optional[Dict]:
     rec = s.run("""
       OPTIONAL MATCH (ss:Season)
       WHERE ss.start <= datetime() AND ss.end > datetime()
@@ -468,10 +489,12 @@ def upsert_season(s: Session, payload: Dict) -> Dict:
           ss.theme=$theme, ss.xp_boost=coalesce($xp_boost,1.0)
       RETURN ss
     """, **payload).single()
+    _invalidate_active_season()
     return dict(rec["ss"])
 
 def delete_season(s: Session, *, id: str) -> None:
     s.run("MATCH (ss:Season {id:$id}) DETACH DELETE ss", id=id)
+    _invalidate_active_season()
 
 # ───────────────────────────────────────────────────────────────────────────────
 # TUNING (Multipliers)
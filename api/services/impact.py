@@ -1,16 +1,34 @@
 # api/services/impact.py
 from __future__ import annotations
-from typing import Optional, Dict, Any, Tuple, List
-from datetime import datetime, timezone, timedelta
+from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from hashlib import blake2b
+from time import time_ns
 from uuid import uuid4
-from neo4j import Session
+from neo4j import Session, Transaction
 
 def _now_ms() -> int:
-    return int(datetime.now(timezone.utc).timestamp() * 1000)
+    return time_ns() // 1_000_000
 
 def new_id(prefix: str) -> str:
     return f"{prefix}_{uuid4().hex[:12]}"
 
+class IdempotencyConflict(ValueError):
+    """An Idempotency-Key was reused with a different request payload."""
+
+def idempotent_tx_id(business_id: str, op: str, key: str) -> str:
+    """EcoTx id derived from (business, operation, Idempotency-Key): a retry on
+    any worker MERGEs onto the same node instead of minting again."""
+    return "eco_tx_" + blake2b(f"{business_id}|{op}|{key}".encode(), digest_size=8).hexdigest()
+
+def scan_fingerprint(youth_id: str, event_key: str) -> str:
+    return blake2b(f"{youth_id}|{event_key}".encode(), digest_size=8).hexdigest()
+
+@lru_cache(maxsize=16)
+def _cooldown_ms(hours: int) -> int:
+    """Youth cooldown window in ms; only a handful of distinct hour values exist."""
+    return max(1, hours) * 3_600_000
+
 # -------------------- Impact Event Catalog (server-defined) --------------------
 IMPACT_EVENTS: Dict[str, Dict[str, Any]] = {
     "bring_your_cup": {
@@ -125,7 +143,7 @@ def compute_and_store_bis(s: Session, *, business_id: str) -> Dict[str, Any]:
     # Freshness decay: if older than ~90 days, subtract up to 10
     decay = 0
     if rec["upd"]:
-        age_days = max(0, (datetime.now(timezone.utc).timestamp()*1000 - rec["upd"]) / (1000*60*60*24))
+        age_days = max(0, (_now_ms() - rec["upd"]) / (1000*60*60*24))
         decay = min(10, int(age_days // 30))  # 1 point per ~month, cap 10
     bis = max(0, min(100, base - decay))
 
@@ -159,6 +177,126 @@ def enable_events_for_business(s: Session, *, business_id: str, event_keys: List
     return {"ok": True, "enabled": valid}
 
 # -------------------- Scan & Mint --------------------
+_SCAN_META_Q = """
+MATCH (b:BusinessProfile {id:$bid})
+OPTIONAL MATCH (y:User {id:$yid})
+RETURN b.enabled_event_keys AS enabled, b.impact_score AS bis, y.id AS yid
+"""
+
+_BATCH_META_Q = """
+MATCH (b:BusinessProfile {id:$bid})
+RETURN b.enabled_event_keys AS enabled, b.impact_score AS bis
+"""
+
+# Mint a scan EcoTx only if the cooldown / burst counts (computed in the same
+# statement) allow it. Returns the counts so the caller can report the reason.
+# Touching b first takes its write lock, so concurrent mints for one business
+# queue up and each counts the scans the previous one committed.
+_GUARDED_MINT_Q = """
+MATCH (b:BusinessProfile {id:$bid})
+MATCH (y:User {id:$yid})
+SET b.last_scan_at = $now
+WITH b, y
+OPTIONAL MATCH (prev:EcoTx {id:$txid})
+OPTIONAL MATCH (b)-[:TRIGGERED]->(t0:EcoTx {kind:'scan'})
+WHERE t0.createdAt >= $since
+OPTIONAL MATCH (t0)<-[:EARNED]-(y0:User {id:$yid})
+WITH b, y, prev,
+     count(CASE WHEN y0 IS NOT NULL AND t0.event_key=$ek AND t0.createdAt >= $sinceYouth THEN 1 END) AS youth_c,
+     count(CASE WHEN t0.createdAt >= $sinceBiz THEN 1 END) AS biz_c
+// An existing $txid is a retry of an Idempotency-Key: nothing is written and
+// the totals are only bumped on the call that creates the EcoTx.
+FOREACH (_ IN CASE WHEN prev IS NULL AND youth_c = 0 AND biz_c < $burstMax THEN [1] ELSE [] END |
+  CREATE (t:EcoTx {id:$txid})
+  SET t.amount=$eco,
+      t.kind='scan',
+      t.event_key=$ek,
+      t.createdAt=$now,
+      t.evidence=$evidence,
+      t.client_ip=$cip,
+      t.device_id=$dev,
+      t.idem_fp=$fp
+  MERGE (b)-[:TRIGGERED]->(t)
+  MERGE (y)-[:EARNED]->(t)
+  SET b.eco_given_total = coalesce(b.eco_given_total,0) + $eco,
+      b.minted_eco       = coalesce(b.minted_eco,0) - $eco
+)
+RETURN youth_c, biz_c, prev IS NOT NULL AS replayed, prev.amount AS prev_eco, prev.idem_fp AS prev_fp
+"""
+
+# At most this many scan mints per business inside its burst window
+# (business_cooldown_seconds), across single scans and batches alike.
+BUSINESS_BURST_MAX = 3
+
+def _tx_guarded_mint(tx: Transaction, params: Dict[str, Any]) -> Dict[str, Any]:
+    rec = tx.run(_GUARDED_MINT_Q, **params).single()
+    return rec.data() if rec else {}
+
+# Batch form of _GUARDED_MINT_Q, under the same business lock: the burst count is
+# taken once, each row's youth cooldown is counted inside the write, and at most
+# ($burstMax - biz_c) eligible rows (in request order) are minted. Rows whose
+# txid already exists (Idempotency-Key retries) are left alone. Returns one
+# {i, reason, prev_eco, prev_fp} per row; reason is null for minted rows.
+_BATCH_GUARDED_MINT_Q = """
+MATCH (b:BusinessProfile {id:$bid})
+SET b.last_scan_at = $now
+WITH b
+OPTIONAL MATCH (b)-[:TRIGGERED]->(tb:EcoTx {kind:'scan'})
+WHERE tb.createdAt >= $sinceBiz
+WITH b, count(tb) AS biz_c
+UNWIND $rows AS row
+OPTIONAL MATCH (y:User {id: row.yid})
+OPTIONAL MATCH (prev:EcoTx {id: row.txid})
+CALL {
+  WITH b, y, row
+  OPTIONAL MATCH (b)-[:TRIGGERED]->(t0:EcoTx {kind:'scan'})<-[:EARNED]-(y)
+  WHERE t0.event_key = row.ek AND t0.createdAt >= row.since
+  RETURN count(t0) AS youth_c
+}
+WITH b, biz_c, row, y, youth_c, prev
+ORDER BY row.i
+WITH b, biz_c, collect({row: row, y: y, youth_c: youth_c, prev: prev}) AS cands
+WITH b, cands,
+     [c IN cands WHERE c.prev IS NULL AND c.y IS NOT NULL AND c.youth_c = 0]
+       [0..CASE WHEN $burstMax > biz_c THEN $burstMax - biz_c ELSE 0 END] AS accepted
+WITH b, cands, accepted, [c IN accepted | c.row.i] AS accepted_i
+CALL {
+  WITH b, accepted
+  UNWIND accepted AS c
+  WITH b, c.y AS y, c.row AS row
+  CREATE (t:EcoTx {id: row.txid})
+  SET t.amount=row.eco,
+      t.kind='scan',
+      t.event_key=row.ek,
+      t.createdAt=$now,
+      t.evidence=row.evidence,
+      t.client_ip=$cip,
+      t.device_id=row.dev,
+      t.idem_fp=row.fp
+  MERGE (b)-[:TRIGGERED]->(t)
+  MERGE (y)-[:EARNED]->(t)
+  RETURN sum(row.eco) AS total
+}
+SET b.eco_given_total = coalesce(b.eco_given_total,0) + total,
+    b.minted_eco       = coalesce(b.minted_eco,0) - total
+RETURN [c IN cands | {
+  i: c.row.i,
+  prev_eco: c.prev.amount,
+  prev_fp: c.prev.idem_fp,
+  reason: CASE
+    WHEN c.prev IS NOT NULL THEN 'replayed'
+    WHEN c.y IS NULL THEN 'youth_not_found'
+    WHEN c.youth_c > 0 THEN 'youth_cooldown'
+    WHEN c.row.i IN accepted_i THEN null
+    ELSE 'business_burst'
+  END
+}] AS results
+"""
+
+def _tx_batch_guarded_mint(tx: Transaction, params: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+    rec = tx.run(_BATCH_GUARDED_MINT_Q, **params).single()
+    return {int(r["i"]): r for r in (rec["results"] if rec else [])}
+
 def record_scan_mint(
     s: Session,
     *,
@@ -168,16 +306,11 @@ def record_scan_mint(
     evidence: Optional[Dict[str, Any]] = None,
     client_ip: Optional[str] = None,
     device_id: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     if event_key not in IMPACT_EVENTS:
         raise ValueError("Unknown event")
-    rec = s.run(
-        """
-        MATCH (b:BusinessProfile {id:$bid})
-        OPTIONAL MATCH (y:User {id:$yid})
-        RETURN b.enabled_event_keys AS enabled, b.impact_score AS bis, y.id AS yid
-        """, bid=business_id, yid=youth_id
-    ).single()
+    rec = s.run(_SCAN_META_Q, bid=business_id, yid=youth_id).single()
     if not rec or not rec["yid"]:
         raise ValueError("Business or youth not found")
     enabled = rec["enabled"] or []
@@ -186,33 +319,11 @@ def record_scan_mint(
 
     # Cooldowns
     ev = IMPACT_EVENTS[event_key]
-    youth_hours = int(ev.get("youth_cooldown_hours", 6))
     business_burst = int(ev.get("business_cooldown_seconds", 2))
+    now = _now_ms()
 
-    # Per-youth cooldown on this business+event
-    rows = s.run(
-        """
-        MATCH (b:BusinessProfile {id:$bid})-[:TRIGGERED]->(t:EcoTx {kind:'scan'})<-[:EARNED]-(y:User {id:$yid})
-        WHERE t.event_key=$ek AND t.createdAt >= $sinceYouth
-        RETURN count(t) AS c
-        """,
-        bid=business_id, yid=youth_id, ek=event_key,
-        sinceYouth=_now_ms() - youth_hours*60*60*1000
-    ).single()
-    if rows and int(rows["c"]) > 0:
-        return {"ok": False, "reason": "youth_cooldown", "awarded_eco": 0}
-
-    # Simple business burst control (avoid mass scans in a second)
-    rows2 = s.run(
-        """
-        MATCH (b:BusinessProfile {id:$bid})-[:TRIGGERED]->(t:EcoTx {kind:'scan'})
-        WHERE t.createdAt >= $sinceBiz
-        RETURN count(t) AS c
-        """,
-        bid=business_id, sinceBiz=_now_ms() - business_burst*1000
-    ).single()
-    if rows2 and int(rows2["c"]) >= 3:
-        return {"ok": False, "reason": "business_burst", "awarded_eco": 0}
+    since_youth = now - _cooldown_ms(int(ev.get("youth_cooldown_hours", 6)))
+    since_biz = now - business_burst*1000
 
     # Compute ECO
     bis = int(rec["bis"] or 50)
@@ -220,28 +331,32 @@ def record_scan_mint(
     base = int(IMPACT_EVENTS[event_key]["base_eco"])
     eco = max(1, int(round(base * mult)))
 
-    txid = new_id("eco_tx")
-
-    s.run(
-        """
-        MATCH (b:BusinessProfile {id:$bid})
-        MATCH (y:User {id:$yid})
-        MERGE (t:EcoTx {id:$txid})
-          ON CREATE SET t.amount=$eco,
-                        t.kind='scan',
-                        t.event_key=$ek,
-                        t.createdAt=$now,
-                        t.evidence=$evidence,
-                        t.client_ip=$cip,
-                        t.device_id=$dev
-        MERGE (b)-[:TRIGGERED]->(t)
-        MERGE (y)-[:EARNED]->(t)
-        SET b.eco_given_total = coalesce(b.eco_given_total,0) + $eco,
-            b.minted_eco       = coalesce(b.minted_eco,0) - $eco
-        """,
+    txid = idempotent_tx_id(business_id, "scan", idempotency_key) if idempotency_key else new_id("eco_tx")
+    fp = scan_fingerprint(youth_id, event_key)
+    params = dict(
         bid=business_id, yid=youth_id, txid=txid, eco=eco, ek=event_key,
-        now=_now_ms(), evidence=evidence or {}, cip=client_ip, dev=device_id
+        now=now, evidence=evidence or {}, cip=client_ip, dev=device_id, fp=fp,
     )
+    # One statement checks the cooldowns and writes; no separate stats read.
+    g = s.execute_write(
+        _tx_guarded_mint,
+        dict(
+            params, since=min(since_youth, since_biz), sinceYouth=since_youth, sinceBiz=since_biz,
+            burstMax=BUSINESS_BURST_MAX,
+        ),
+    )
+    youth_c, biz_c = int(g.get("youth_c") or 0), int(g.get("biz_c") or 0)
+
+    if g.get("replayed"):
+        if g.get("prev_fp") != fp:
+            raise IdempotencyConflict("Idempotency-Key reused with a different scan")
+        eco = int(g.get("prev_eco") or eco)
+    # Per-youth cooldown on this business+event
+    elif youth_c > 0:
+        return {"ok": False, "reason": "youth_cooldown", "awarded_eco": 0}
+    # Simple business burst control (avoid mass scans in a second)
+    elif biz_c >= BUSINESS_BURST_MAX:
+        return {"ok": False, "reason": "business_burst", "awarded_eco": 0}
 
     return {
         "ok": True,
@@ -252,3 +367,94 @@ def record_scan_mint(
         "base_eco": base,
         "event_key": event_key,
     }
+
+def record_scan_mints(
+    s: Session,
+    *,
+    business_id: str,
+    scans: List[Dict[str, Any]],
+    client_ip: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Batch form of record_scan_mint for kiosks posting several scans at once.
+    One meta read and one guarded UNWIND write, regardless of batch size. Each
+    scan is a dict with event_key, youth_id and optional evidence/device_id;
+    results come back in the same order.
+
+    The youth cooldowns and the business burst guard are enforced inside the
+    write, exactly as for single scans: a batch mints at most the remaining
+    burst budget and the rest come back as "business_burst". With an
+    idempotency_key each row gets a derived tx id, so a retried batch replays
+    the rows it already minted instead of minting them again.
+    """
+    meta = s.run(_BATCH_META_Q, bid=business_id).single()
+    if not meta:
+        raise ValueError("Business not found")
+    enabled = set(meta["enabled"] or [])
+    bis = int(meta["bis"] or 50)
+    mult = bis_multiplier(bis)
+    now = _now_ms()
+
+    out: List[Dict[str, Any]] = [{} for _ in scans]
+    rows: List[Dict[str, Any]] = []
+    seen: set = set()
+    burst_s = 0
+    for i, sc in enumerate(scans):
+        ek, yid = sc["event_key"], sc["youth_id"]
+        if ek not in IMPACT_EVENTS:
+            out[i] = {"ok": False, "reason": "unknown_event", "awarded_eco": 0, "youth_id": yid}
+        elif ek not in enabled:
+            out[i] = {"ok": False, "reason": "event_not_enabled", "awarded_eco": 0, "youth_id": yid}
+        elif (yid, ek) in seen:
+            out[i] = {"ok": False, "reason": "youth_cooldown", "awarded_eco": 0, "youth_id": yid}
+        else:
+            seen.add((yid, ek))
+            ev = IMPACT_EVENTS[ek]
+            burst_s = max(burst_s, int(ev.get("business_cooldown_seconds", 2)))
+            rows.append({
+                "i": i,
+                "yid": yid,
+                "ek": ek,
+                "since": now - _cooldown_ms(int(ev.get("youth_cooldown_hours", 6))),
+                "txid": (
+                    idempotent_tx_id(business_id, "scan:batch", f"{idempotency_key}#{i}")
+                    if idempotency_key else new_id("eco_tx")
+                ),
+                "fp": scan_fingerprint(yid, ek),
+                "eco": max(1, int(round(int(ev["base_eco"]) * mult))),
+                "evidence": sc.get("evidence") or {},
+                "dev": sc.get("device_id"),
+            })
+
+    if rows:
+        reasons = s.execute_write(
+            _tx_batch_guarded_mint,
+            dict(
+                bid=business_id, rows=rows, now=now, cip=client_ip,
+                sinceBiz=now - burst_s * 1000, burstMax=BUSINESS_BURST_MAX,
+            ),
+        )
+        for r in rows:
+            res = reasons.get(r["i"]) or {"reason": "youth_not_found"}
+            reason = res["reason"]
+            if reason == "replayed":
+                if res.get("prev_fp") != r["fp"]:
+                    reason = "idempotency_conflict"
+                else:
+                    reason, r["eco"] = None, int(res.get("prev_eco") or r["eco"])
+            if reason:
+                out[r["i"]] = {"ok": False, "reason": reason, "awarded_eco": 0, "youth_id": r["yid"]}
+            else:
+                out[r["i"]] = {
+                    "ok": True,
+                    "tx_id": r["txid"],
+                    "awarded_eco": r["eco"],
+                    "bis": bis,
+                    "multiplier": mult,
+                    "base_eco": int(IMPACT_EVENTS[r["ek"]]["base_eco"]),
+                    "event_key": r["ek"],
+                    "youth_id": r["yid"],
+                }
+
+    return out
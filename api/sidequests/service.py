@@ -5,11 +5,13 @@ from datetime import date, datetime, timedelta, timezone
 from uuid import uuid4
 from math import radians, sin, cos, asin, sqrt
 import os
+import traceback
 
 from fastapi import HTTPException
 from neo4j import Session
 
 from site_backend.core.urls import abs_media
+from site_backend.api.eco_local import balance_cache
 
 from .schema import (
     SidequestCreate, SidequestUpdate, SidequestOut,
@@ -1321,7 +1323,11 @@ def _award_on_approval(session: Session, submission_id: str) -> None:
         MATCH (u:User {id:$uid})
         MATCH (sub:Submission {id:$sid})-[:FOR]->(sq:Sidequest {id:$mid})
         MERGE (t:EcoTx {id:$sid})                          // submission id as tx id
+        WITH u, sub, sq, t,
+             CASE WHEN t.kind = 'MINT_ACTION' AND t.status = 'settled'
+                  THEN toInteger(coalesce(t.eco, t.amount, 0)) ELSE 0 END AS prev_eco
         SET  t.eco       = $eco_total,
+             t.amount    = $eco_total,                 // keep amount in step (backfill may have set it)
              t.xp        = toInteger(coalesce(sq.xp_reward, 0)),
              t.bonus     = $bonus,
              t.at        = datetime($now),
@@ -1333,6 +1339,8 @@ def _award_on_approval(session: Session, submission_id: str) -> None:
         MERGE (u)-[:EARNED]->(t)
         MERGE (t)-[:FOR]->(sq)
         MERGE (t)-[:PROOF]->(sub)
+        // Denormalized wallet (net of any earlier write of this same tx)
+        SET u.eco_balance = u.eco_balance + $eco_total - prev_eco
         """,
         {
             "uid": uid,
@@ -1343,6 +1351,9 @@ def _award_on_approval(session: Session, submission_id: str) -> None:
             "now": now,
         },
     )
+    # The tx is MERGEd on submission id (re-approval rewrites it), so drop the
+    # cached wallet balance rather than incrementing it.
+    balance_cache.invalidate(uid)
 
     # 4) Optional team bonus link (kept as-is, but matches `t` safely)
     if team_allowed and sub_team:
@@ -1479,9 +1490,21 @@ def rotate_weekly_sidequests(session: Session, payload: RotationRequest) -> Rota
         window=payload,
     )
 
-def bulk_upsert(session: Session, sidequests: List[Dict[str, Any]]) -> Dict[str, Any]:
-    import traceback
+def _trace_tail(e: BaseException) -> str:
+    """
+    Innermost frame of e's traceback as 'file:line in fn | source'. Walks to the
+    last frame and extracts only that one, rather than formatting the whole
+    stack per failing row.
+    """
+    tb = e.__traceback__
+    if tb is None:
+        return ""
+    while tb.tb_next is not None:
+        tb = tb.tb_next
+    fs = traceback.extract_tb(tb, limit=1)[0]
+    return f"{fs.filename}:{fs.lineno} in {fs.name} | {fs.line or ''}"
 
+def bulk_upsert(session: Session, sidequests: List[Dict[str, Any]]) -> Dict[str, Any]:
     created = 0
     updated = 0
     errors: List[str] = []
@@ -1518,9 +1541,8 @@ def bulk_upsert(session: Session, sidequests: List[Dict[str, Any]]) -> Dict[str,
                         create_sidequest(session, mc, forced_id=sid)
                         created += 1
                 except Exception as e:
-                    tb = traceback.format_exc().strip().splitlines()[-2:]
                     errors.append(
-                        f"row {idx}: upsert:{type(e).__name__}: {e} | keys={sorted(list(raw.keys()))} | trace_tail={' | '.join(tb)}"
+                        f"row {idx}: upsert:{type(e).__name__}: {e} | keys={sorted(list(raw.keys()))} | trace_tail={_trace_tail(e)}"
                     )
             else:
                 mc = SidequestCreate(**payload)
@@ -1528,8 +1550,7 @@ def bulk_upsert(session: Session, sidequests: List[Dict[str, Any]]) -> Dict[str,
                 created += 1
 
         except Exception as e:
-            tb = traceback.format_exc().strip().splitlines()[-2:]
-            errors.append(f"row {idx}: unknown:{type(e).__name__}: {e} | trace_tail={' | '.join(tb)}")
+            errors.append(f"row {idx}: unknown:{type(e).__name__}: {e} | trace_tail={_trace_tail(e)}")
 
     return {"created": created, "updated": updated, "errors": errors}
 
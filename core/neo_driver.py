@@ -1,15 +1,34 @@
 from __future__ import annotations
-from typing import Generator
+import os
+from typing import AsyncIterator, Generator
 from contextlib import contextmanager
-from neo4j import GraphDatabase, Driver
+from neo4j import AsyncDriver, AsyncGraphDatabase, AsyncSession, GraphDatabase, Driver
+from neo4j.exceptions import Neo4jError
 from fastapi import Request
 
+# One sync + one async driver per process (built in lifespan); request sessions
+# are leases off these pools, never new drivers.
+POOL_OPTS = {
+    "max_connection_pool_size": int(os.getenv("NEO4J_MAX_POOL_SIZE", "100")),
+    "connection_acquisition_timeout": float(os.getenv("NEO4J_ACQUIRE_TIMEOUT_S", "30")),
+    "max_connection_lifetime": int(os.getenv("NEO4J_MAX_CONN_LIFETIME_S", "3600")),
+}
+
+# Naming the database up front spares every new session the home-database
+# lookup; unset keeps the server default.
+SESSION_OPTS = {"database": os.environ["NEO4J_DATABASE"]} if os.getenv("NEO4J_DATABASE") else {}
+
 def build_driver(uri: str, user: str, password: str) -> Driver:
-    driver = GraphDatabase.driver(uri, auth=(user, password))
+    driver = GraphDatabase.driver(uri, auth=(user, password), **POOL_OPTS)
     # quick connectivity test
-    with driver.session() as s:
+    with driver.session(**SESSION_OPTS) as s:
         s.run("RETURN 1").consume()
     return driver
+
+async def build_async_driver(uri: str, user: str, password: str) -> AsyncDriver:
+    driver = AsyncGraphDatabase.driver(uri, auth=(user, password), **POOL_OPTS)
+    await driver.verify_connectivity()
+    return driver
 # site_backend/core/neo_driver.py
 
 def ensure_constraints(driver: Driver) -> None:
@@ -20,14 +39,31 @@ def ensure_constraints(driver: Driver) -> None:
         "CREATE CONSTRAINT biz_user_unique IF NOT EXISTS FOR (b:BusinessProfile) REQUIRE b.user_id IS UNIQUE",
         # NEW: ensure BusinessProfile.id exists & is unique
         "CREATE CONSTRAINT business_id IF NOT EXISTS FOR (b:BusinessProfile) REQUIRE b.id IS UNIQUE",
+        "CREATE CONSTRAINT tag_name IF NOT EXISTS FOR (t:Tag) REQUIRE t.name IS UNIQUE",
+        # QR scan lookups + scan cooldown / per-device stats
+        "CREATE INDEX qr_code IF NOT EXISTS FOR (q:QR) ON (q.code)",
+        "CREATE INDEX ecotx_scan_device IF NOT EXISTS FOR (t:EcoTx) ON (t.device_id, t.kind, t.createdAt)",
+        # kind + time-window filters (scan cooldowns, 30d stats, ledger sums)
+        "CREATE INDEX ecotx_kind_created IF NOT EXISTS FOR (t:EcoTx) ON (t.kind, t.createdAt)",
+        "CREATE INDEX ecotx_created IF NOT EXISTS FOR (t:EcoTx) ON (t.createdAt)",
     ]
-    with driver.session() as s:
+    # EcoTx ids double as idempotency keys (derived from Idempotency-Key on scans).
+    # Older graphs may hold duplicate ids; the constraint then fails to build, so
+    # log it and keep serving (the guarded mint still checks for the id first).
+    # Find offenders with:
+    #   MATCH (t:EcoTx) WITH t.id AS id, count(*) AS n WHERE n > 1 RETURN id, n
+    ecotx_id = "CREATE CONSTRAINT ecotx_id IF NOT EXISTS FOR (t:EcoTx) REQUIRE t.id IS UNIQUE"
+    with driver.session(**SESSION_OPTS) as s:
         for q in stmts:
             s.run(q).consume()
+        try:
+            s.run(ecotx_id).consume()
+        except Neo4jError as e:
+            print(f"[neo4j] ecotx_id constraint not created (duplicate EcoTx ids?): {e}")
 
 @contextmanager
 def neo_session(driver: Driver):
-    with driver.session() as s:
+    with driver.session(**SESSION_OPTS) as s:
         yield s
 
 # FastAPI dependency: yields a session using app.state.driver
@@ -35,3 +71,15 @@ def session_dep(request: Request):
     driver: Driver = request.app.state.driver  # type: ignore[attr-defined]
     with neo_session(driver) as s:
         yield s
+
+# Async variants: app.state.async_driver is built next to the sync driver in lifespan.
+# An AsyncSession runs one query at a time, so handlers that fan reads out with
+# asyncio.gather take the driver and open one session per concurrent read.
+# async def so FastAPI calls it inline rather than via the threadpool.
+async def async_driver_dep(request: Request) -> AsyncDriver:
+    return request.app.state.async_driver  # type: ignore[attr-defined]
+
+async def async_session_dep(request: Request) -> AsyncIterator[AsyncSession]:
+    driver: AsyncDriver = request.app.state.async_driver  # type: ignore[attr-defined]
+    async with driver.session(**SESSION_OPTS) as s:
+        yield s
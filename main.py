@@ -31,7 +31,8 @@ from pydantic import ValidationError
 from neo4j import Driver
 from neo4j.exceptions import Neo4jError
 
-from site_backend.core.neo_driver import build_driver, ensure_constraints
+from site_backend.core.neo_driver import build_driver, build_async_driver, ensure_constraints, SESSION_OPTS
+from site_backend.api.eco_local.neo_business import backfill_ecotx_amounts
 from site_backend.core import admin_cookie
 from site_backend.api import auth, profile, stats
 from site_backend.api.eco_home import home_routes
@@ -74,12 +75,20 @@ async def admin_ping(email: str = Depends(require_admin)):
 async def lifespan(app: FastAPI):
     driver: Driver = build_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD) # This will no longer fail
     ensure_constraints(driver)
-    
+    # EcoTx readers sum t.amount only; copy legacy t.eco across before serving.
+    try:
+        with driver.session(**SESSION_OPTS) as s:
+            print("[lifespan] EcoTx amount backfill:", backfill_ecotx_amounts(s))
+    except Neo4jError as e:
+        print(f"[lifespan] EcoTx amount backfill failed: {e}")
+
     app.state.driver = driver
+    app.state.async_driver = await build_async_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
     print("[lifespan] Neo4j connected & constraints ensured")
     try:
         yield
     finally:
+        await app.state.async_driver.close()
         driver.close()
         print("[lifespan] driver closed")
 